@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# Discovery across several Bluetooth adapters against simulated coolers: scan
+# wall time for 1..4 adapters (it should stay about one scan window), and
+# whether the connection goes through the adapter that hears the cooler best.
+# Usage: python benchmarks/bench_adapters.py [rounds]
+
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from watercooler_manager.device import WaterCoolingDevice
+from watercooler_manager.simulator import SimulatedBackend, SimulatedCooler
+from watercooler_manager.transport import BleakBackend
+
+SCAN_WINDOW = 1.0
+
+
+class CheckedBackend(SimulatedBackend):
+    # Also builds a real BleakScanner (without starting it) for every scan, so
+    # discover()'s detection callback goes through bleak's own checks
+    def scanner(self, detection_callback, adapter=None, service_uuids=None):
+        BleakBackend().scanner(detection_callback, None, service_uuids)
+        return super().scanner(detection_callback, adapter, service_uuids)
+
+
+def make_backend(adapters, seed):
+    rng = random.Random(seed)
+    names = [f"hci{i}" for i in range(adapters)]
+    coolers = [SimulatedCooler(address=f"SIM:00:00:00:00:{i + 1:02X}", seed=seed + i,
+                               adapter_rssi={name: rng.randint(-95, -45) for name in names})
+               for i in range(2)]
+    return CheckedBackend(coolers, adapters=names), coolers
+
+
+async def run(rounds):
+    print(f"{'adapters':>8s} {'list scan':>10s} {'find+connect':>13s} {'best adapter':>13s}")
+    for adapters in (1, 2, 4):
+        scans, connects, correct = [], [], 0
+        for i in range(rounds):
+            backend, coolers = make_backend(adapters, i)
+            device = WaterCoolingDevice(backend=backend)
+
+            start = time.perf_counter()
+            await device.get_device_list(timeout=SCAN_WINDOW)
+            scans.append(time.perf_counter() - start)
+
+            device = WaterCoolingDevice(backend=backend)
+            start = time.perf_counter()
+            target = await device.find_device()
+            await device.connect(target.uuid)
+            connects.append(time.perf_counter() - start)
+            cooler = backend.cooler(target.uuid)
+            best = max(cooler.adapter_rssi, key=cooler.adapter_rssi.get)
+            correct += cooler.link.adapter == best
+            await device.disconnect()
+        print(f"{adapters:8d} {statistics.median(scans) * 1000:8.1f}ms {statistics.median(connects) * 1000:11.1f}ms"
+              f" {correct:>6d}/{rounds}")
+
+
+if __name__ == "__main__":
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 5))
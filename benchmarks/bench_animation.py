@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# Achieved frame rate of the RGB animator against the simulated cooler, for a
+# range of target rates, with acknowledged writes and write-without-response.
+# Above what the link sustains, ticks are dropped instead of queued. A steady
+# load-following effect shows ticks skipped because the color did not change.
+# Usage: python benchmarks/bench_animation.py [seconds]
+
+import asyncio
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from watercooler_manager.animation import Animator, gradient, levels
+from watercooler_manager.device import WaterCoolingDevice
+from watercooler_manager.simulator import SimulatedBackend, SimulatedCooler
+
+TARGETS = (10, 30, 60, 120)
+
+
+async def measure(palette, fps, seconds, write_without_response, level=None):
+    cooler = SimulatedCooler(supports_write_without_response=write_without_response)
+    device = WaterCoolingDevice(backend=SimulatedBackend([cooler]))
+    await device.connect(cooler.address, name=cooler.name)
+    animator = Animator(device)
+    if level is None:
+        animator.play(palette, fps)
+    else:
+        animator.follow(palette, level, fps)
+    await asyncio.sleep(seconds)
+    animator.stop()
+    await device.disconnect()
+    return animator
+
+
+async def run(seconds):
+    palette = gradient([(255, 0, 0), (0, 255, 0), (0, 0, 255)], steps=64)
+    print(f"palette: {len(palette)} frames")
+    print(f"{'link':24s} {'target':>7s} {'achieved':>9s} {'dropped':>8s} {'skipped':>8s} {'failed':>7s}")
+    for write_without_response in (False, True):
+        mode = "write-without-response" if write_without_response else "acknowledged"
+        for fps in TARGETS:
+            animator = await measure(palette, fps, seconds, write_without_response)
+            print(f"{mode:24s} {fps:7d} {animator.achieved_fps:9.1f} {animator.dropped:8d}"
+                  f" {animator.suppressed:8d} {animator.failed:7d}")
+    animator = await measure(levels((0, 255, 0), (255, 0, 0)), 30, seconds, True, level=lambda: 0.5)
+    print(f"{'steady load':24s} {30:7d} {animator.achieved_fps:9.1f} {animator.dropped:8d}"
+          f" {animator.suppressed:8d} {animator.failed:7d}")
+
+    # Lookups only: the palette hands out prebuilt frames, nothing is allocated per tick
+    frames = palette.frames
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for tick in range(100_000):
+        frames[tick % len(frames)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    grown = sum(stat.size_diff for stat in after.compare_to(before, "filename") if stat.size_diff > 0
+                and "tracemalloc" not in str(stat.traceback))
+    print(f"allocated over 100000 palette ticks: {grown} bytes")
+
+
+if __name__ == "__main__":
+    asyncio.run(run(float(sys.argv[1]) if len(sys.argv) > 1 else 2.0))
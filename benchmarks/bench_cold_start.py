@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# Cold-start-to-connected time: scan + connect vs. direct connect to the
+# cached address, read back from the saved cache. Needs a real cooler in
+# range, or --simulate for the in-process simulated one (with a throwaway cache file).
+# Usage: python benchmarks/bench_cold_start.py [--simulate] [rounds]
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from watercooler_manager.cache import DeviceCache
+from watercooler_manager.device import WaterCoolingDevice
+from watercooler_manager.simulator import SimulatedBackend
+
+
+async def scan_and_connect(backend):
+    device = WaterCoolingDevice(backend=backend)
+    start = time.perf_counter()
+    devices = await device.get_device_list()
+    if not devices:
+        raise Exception("CoolingSystem device not found")
+    await device.connect(devices[0].uuid)
+    elapsed = time.perf_counter() - start
+    await device.disconnect()
+    return elapsed, devices[0]
+
+
+async def cached_connect(backend):
+    device = WaterCoolingDevice(backend=backend)
+    start = time.perf_counter()
+    for known in DeviceCache().fresh():
+        try:
+            await device.connect(known.uuid, name=known.name, adapter=known.adapter)
+            break
+        except Exception:
+            continue
+    elapsed = time.perf_counter() - start
+    await device.disconnect()
+    return elapsed
+
+
+async def run(rounds: int, simulate: bool):
+    backend = None
+    pause = 2.0
+    if simulate:
+        backend = SimulatedBackend()
+        DeviceCache.CACHE_FILE = os.path.join(tempfile.mkdtemp(), "devices.json")
+        pause = 0.1
+    cold = []
+    warm = []
+    for _ in range(rounds):
+        elapsed, info = await scan_and_connect(backend)
+        cold.append(elapsed)
+        cache = DeviceCache()
+        cache.remember(info)
+        cache.save()
+        # Give the cooler time to start advertising again
+        await asyncio.sleep(pause)
+        warm.append(await cached_connect(backend))
+        await asyncio.sleep(pause)
+
+    print(f"scan + connect:  {sum(cold) / rounds * 1000:8.1f} ms")
+    print(f"cached connect:  {sum(warm) / rounds * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    simulate = "--simulate" in args
+    if simulate:
+        args.remove("--simulate")
+    asyncio.run(run(int(args[0]) if args else 3, simulate))
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# Bursty click benchmark for the coalescing command queue.
+# Usage: python benchmarks/bench_command_queue.py [clicks] [click_interval_ms] [write_ms]
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from watercooler_manager.command_queue import CommandQueue
+from watercooler_manager.enums import Commands
+
+
+def frame(command: int, value: int) -> bytes:
+    return bytes([0xfe, command, 0x01, value, 0x00, 0x00, 0x00, 0xef])
+
+
+async def run(clicks: int, click_interval: float, write_time: float):
+    writes = 0
+
+    async def write(data: bytes, response: bool = True):
+        nonlocal writes
+        writes += 1
+        await asyncio.sleep(write_time)
+
+    queue = CommandQueue(write)
+    futures = []
+    commands = (Commands.RGB, Commands.FAN, Commands.RGB, Commands.PUMP)
+    for i in range(clicks):
+        futures.append(queue.submit(frame(commands[i % len(commands)], i & 0xff)))
+        await asyncio.sleep(click_interval)
+    await asyncio.gather(*futures)
+    queue.stop()
+
+    print(f"clicks:           {clicks} every {click_interval * 1000:.1f} ms")
+    print(f"frames sent:      {writes} (fire-and-forget would send {clicks})")
+    print(f"frames coalesced: {queue.coalesced}")
+    print(f"latency mean:     {queue.latency_mean * 1000:.1f} ms")
+    print(f"latency max:      {queue.latency_max * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    clicks = int(args[0]) if len(args) > 0 else 40
+    interval = float(args[1]) if len(args) > 1 else 10.0
+    write_ms = float(args[2]) if len(args) > 2 else 45.0
+    asyncio.run(run(clicks, interval / 1000, write_ms / 1000))
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# Discovery in a crowded room: thousands of synthetic adverts from unrelated
+# BLE devices, with two coolers among them, fed through get_device_list().
+# Reports CPU time and peak traced memory per scan, with and without the
+# service UUID scan filter, and the cost of matching one advertised name.
+# Usage: python benchmarks/bench_discovery.py [adverts] [rounds]
+
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from watercooler_manager.device import WaterCoolingDevice
+from watercooler_manager.enums import NordicUART
+from watercooler_manager.models import LCTDeviceModel, model_from_name
+from watercooler_manager.simulator import SimulatedAdvertisement, SimulatedBLEDevice
+
+SCAN_WINDOW = 0.2
+BURST = 200
+NAMES = ("Mi Band 7", "JBL Flip 5", "[TV] Samsung 7 Series", "Tile", "AirPods Pro", "MX Master 3", None)
+SERVICES = ("0000180f-0000-1000-8000-00805f9b34fb", "0000fe9f-0000-1000-8000-00805f9b34fb",
+            "0000fd6f-0000-1000-8000-00805f9b34fb")
+
+
+def make_adverts(count, seed=0):
+    rng = random.Random(seed)
+    adverts = []
+    for i in range(count):
+        name = rng.choice(NAMES)
+        adverts.append((SimulatedBLEDevice(f"{i >> 8 & 0xff:02X}:{i & 0xff:02X}:00:00:00:00", name),
+                        SimulatedAdvertisement(rng.randint(-100, -40), [rng.choice(SERVICES)])))
+    for i, model in enumerate((LCTDeviceModel.LCT21001, LCTDeviceModel.LCT22002)):
+        position = rng.randrange(len(adverts))
+        adverts.insert(position, (SimulatedBLEDevice(f"C0:01:00:00:00:{i:02X}", f"{model}-COOLER"),
+                                  SimulatedAdvertisement(-60, [NordicUART.SERVICE_UUID])))
+    return adverts
+
+
+class ReplayScanner:
+    # Delivers the prepared adverts in bursts on the event loop, the way bleak
+    # calls the detection callback
+    def __init__(self, adverts, detection_callback):
+        self.adverts = adverts
+        self.detection_callback = detection_callback
+        self._task = None
+
+    async def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._deliver())
+
+    async def stop(self):
+        self._task.cancel()
+
+    async def _deliver(self):
+        for offset in range(0, len(self.adverts), BURST):
+            for device, adv in self.adverts[offset:offset + BURST]:
+                self.detection_callback(device, adv)
+            await asyncio.sleep(0)
+
+
+class ReplayBackend:
+    def __init__(self, adverts):
+        # A filtered scan only sees what the controller lets through, so the
+        # filtering is done here, outside the measured scans
+        self.adverts = adverts
+        self.filtered = [(device, adv) for device, adv in adverts if NordicUART.SERVICE_UUID in adv.service_uuids]
+
+    def adapters(self):
+        return [None]
+
+    def scanner(self, detection_callback, adapter=None, service_uuids=None):
+        return ReplayScanner(self.filtered if service_uuids else self.adverts, detection_callback)
+
+
+def lower_each_model(name):
+    # How names used to be matched: both sides lower-cased for every model
+    for model in [LCTDeviceModel.LCT21001, LCTDeviceModel.LCT22002]:
+        if model.lower() in name.lower():
+            return model
+    return None
+
+
+async def scan(adverts, scan_filter, rounds):
+    device = WaterCoolingDevice(backend=ReplayBackend(adverts), scan_filter=scan_filter)
+    cpu, peak = [], []
+    for _ in range(rounds):
+        tracemalloc.start()
+        start = time.process_time()
+        found = await device.get_device_list(timeout=SCAN_WINDOW)
+        cpu.append(time.process_time() - start)
+        peak.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        assert len(found) == 2, found
+    return statistics.median(cpu), statistics.median(peak)
+
+
+async def run(count, rounds):
+    adverts = make_adverts(count)
+    print(f"{count} adverts per scan, {SCAN_WINDOW:.1f} s window")
+    for label, scan_filter in (("no scan filter", False), ("service UUID filter", True)):
+        cpu, peak = await scan(adverts, scan_filter, rounds)
+        print(f"{label:22s} cpu {cpu * 1000:7.2f} ms/scan   peak memory {peak / 1024:8.1f} KiB"
+              f"   {cpu / count * 1e6:6.2f} us/advert")
+
+    names = [device.name or "" for device, _ in adverts]
+    for label, match in (("lower() per model", lower_each_model), ("precompiled pattern", model_from_name)):
+        seconds = min(timeit.repeat(lambda: [match(name) for name in names], number=5, repeat=3)) / 5
+        print(f"{label:22s} {seconds / len(names) * 1e9:7.1f} ns/name")
+
+
+if __name__ == "__main__":
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+                    int(sys.argv[2]) if len(sys.argv) > 2 else 5))
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# Concurrent fleet setup: compares wall time against the sum of per-device
+# connect times. Needs real coolers in range, or --simulate N for N simulated ones.
+# Usage: python benchmarks/bench_fleet.py [--simulate N | address ...]
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from watercooler_manager.fleet import DeviceFleet
+from watercooler_manager.simulator import SimulatedBackend, SimulatedCooler
+
+
+async def run(addresses):
+    backend = None
+    if addresses[:1] == ["--simulate"]:
+        count = int(addresses[1]) if len(addresses) > 1 else 4
+        backend = SimulatedBackend([SimulatedCooler(address=f"SIM:00:00:00:00:{i + 1:02X}", seed=i)
+                                    for i in range(count)])
+        addresses = []
+    fleet = DeviceFleet(backend=backend)
+    if not addresses:
+        addresses = await fleet.discover()
+    if not addresses:
+        print("no coolers found")
+        return
+
+    start = time.perf_counter()
+    results = await fleet.connect(addresses)
+    wall = time.perf_counter() - start
+
+    for result in results.values():
+        status = "ok" if result.ok else f"failed: {result.error}"
+        print(f"{result.address:40s} {result.elapsed * 1000:8.1f} ms  {status}")
+    print(f"{'sum of connects':40s} {sum(r.elapsed for r in results.values()) * 1000:8.1f} ms")
+    print(f"{'fleet wall time':40s} {wall * 1000:8.1f} ms")
+
+    start = time.perf_counter()
+    await fleet.run(lambda device: device.write_fan_mode(50))
+    print(f"{'fan command to all':40s} {(time.perf_counter() - start) * 1000:8.1f} ms")
+    await fleet.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(run(sys.argv[1:]))
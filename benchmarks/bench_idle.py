@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# Lazy connection mode against the simulated cooler: a sparse workload (one fan
+# change every `gap` seconds, a compressed version of a few writes per hour)
+# run with the link always held and with idle release. Reports the latency of
+# each command and how much of the session the link was actually open.
+# Usage: python benchmarks/bench_idle.py [writes] [gap] [idle_timeout]
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from watercooler_manager.device import WaterCoolingDevice
+from watercooler_manager.protocol import fan_frame
+from watercooler_manager.simulator import SimulatedBackend, SimulatedCooler
+
+
+async def session(writes, gap, idle_timeout):
+    cooler = SimulatedCooler()
+    device = WaterCoolingDevice(backend=SimulatedBackend([cooler]), idle_timeout=idle_timeout)
+    start = time.monotonic()
+    await device.connect(cooler.address, name=cooler.name)
+    latencies = []
+    for i in range(writes):
+        await asyncio.sleep(gap)
+        begin = time.perf_counter()
+        await device.write_buffer(fan_frame((25, 50, 75, 90)[i % 4]))
+        latencies.append(time.perf_counter() - begin)
+    await device.disconnect()
+    total = time.monotonic() - start
+    return device.metrics, latencies, total
+
+
+async def run(writes, gap, idle_timeout):
+    for label, timeout in (("always connected", None), (f"idle release {idle_timeout:g}s", idle_timeout)):
+        metrics, latencies, total = await session(writes, gap, timeout)
+        print(f"{label:22s} command median {statistics.median(latencies) * 1000:7.1f} ms  "
+              f"max {max(latencies) * 1000:7.1f} ms   link open {metrics.link_seconds:6.2f} s of {total:5.2f} s "
+              f"({metrics.link_seconds / total * 100:5.1f}%)   releases {metrics.idle_releases}")
+        if metrics.wake_seconds.count:
+            print(f"{'':22s} added by reconnecting: mean {metrics.wake_seconds.sum / metrics.wake_seconds.count * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(run(int(args[0]) if args else 5, float(args[1]) if len(args) > 1 else 1.5,
+                    float(args[2]) if len(args) > 2 else 0.5))
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# Cost of the built-in instrumentation: raw Histogram.observe() and
+# Metrics.render() timings, then write throughput against the simulated cooler
+# with metrics on and off (connection interval set to zero so the
+# instrumentation is not hidden behind link latency).
+# Usage: python benchmarks/bench_metrics.py [frames]
+
+import asyncio
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from watercooler_manager.device import WaterCoolingDevice
+from watercooler_manager.enums import Commands
+from watercooler_manager.metrics import Histogram, Metrics
+from watercooler_manager.protocol import fan_frame
+from watercooler_manager.simulator import SimulatedBackend, SimulatedCooler
+
+
+def micro():
+    hist = Histogram()
+    n = 1_000_000
+    per_call = timeit.timeit(lambda: hist.observe(0.042), number=n) / n
+    print(f"{'Histogram.observe':32s} {per_call * 1e9:8.0f} ns")
+
+    metrics = Metrics()
+    per_call = timeit.timeit(lambda: metrics.observe_write(Commands.FAN, 0.042), number=n) / n
+    print(f"{'Metrics.observe_write':32s} {per_call * 1e9:8.0f} ns")
+
+    per_call = timeit.timeit(metrics.render, number=1000) / 1000
+    print(f"{'Metrics.render':32s} {per_call * 1e6:8.1f} us")
+
+
+async def throughput(frames, enabled):
+    cooler = SimulatedCooler(connection_interval=0.0, connect_time=0.0)
+    device = WaterCoolingDevice(backend=SimulatedBackend([cooler]))
+    if not enabled:
+        device.metrics = None
+    await device.connect(cooler.address, name=cooler.name)
+    start = time.perf_counter()
+    for i in range(frames):
+        await device.write_buffer(fan_frame(i % 101))
+    elapsed = time.perf_counter() - start
+    await device.disconnect()
+    return elapsed / frames
+
+
+async def run(frames):
+    micro()
+    off = min([await throughput(frames, False) for _ in range(3)])
+    on = min([await throughput(frames, True) for _ in range(3)])
+    print(f"{'write, metrics off':32s} {off * 1e6:8.1f} us")
+    print(f"{'write, metrics on':32s} {on * 1e6:8.1f} us   ({(on - off) / off * 100:+.1f}%)")
+
+
+if __name__ == "__main__":
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000))
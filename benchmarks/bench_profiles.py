@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# Profile switch time, from selection until the last frame is acknowledged,
+# against the simulated cooler: one batched profile apply vs. the same change
+# made through the Pump, Fan and RGB submenus one click at a time.
+# Usage: python benchmarks/bench_profiles.py [rounds]
+
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from watercooler_manager.device import WaterCoolingDevice
+from watercooler_manager.protocol import pump_frame, fan_frame, rgb_frame, rgb_off_frame
+from watercooler_manager.settings import Settings
+from watercooler_manager.simulator import SimulatedBackend, SimulatedCooler
+
+SEQUENCE = ("Quiet", "Full load", "Balanced")
+
+
+async def by_menu(device, settings, name):
+    # Three separate clicks, each awaited and saved on its own; the last one is
+    # acknowledged so both paths are timed to the same point
+    profile = settings.profiles[name]
+    settings.current_voltage = profile.current_voltage
+    await device.write_buffer(pump_frame(pump_voltage=profile.current_voltage))
+    settings.save()
+    settings.current_fan_speed = profile.current_fan_speed
+    await device.write_buffer(fan_frame(profile.current_fan_speed))
+    settings.save()
+    settings.rgb_is_off = profile.rgb_is_off
+    await device.write_buffer(rgb_off_frame() if profile.rgb_is_off else rgb_frame(*profile.rgb_color, profile.rgb_state),
+                              response=True)
+    settings.save()
+
+
+async def by_profile(device, settings, name):
+    profile = settings.apply_profile(name)
+    await device.apply_profile(profile)
+    settings.save()
+
+
+async def measure(switch, rounds, write_without_response):
+    cooler = SimulatedCooler()
+    device = WaterCoolingDevice(write_without_response=write_without_response, backend=SimulatedBackend([cooler]))
+    await device.connect(cooler.address, name=cooler.name)
+    settings = Settings()
+    samples = []
+    for i in range(rounds):
+        start = time.perf_counter()
+        await switch(device, settings, SEQUENCE[i % len(SEQUENCE)])
+        samples.append(time.perf_counter() - start)
+    settings.flush()
+    await device.disconnect()
+    return statistics.median(samples)
+
+
+async def run(rounds):
+    with tempfile.TemporaryDirectory() as directory:
+        Settings.CONFIG_FILE = os.path.join(directory, "watercooler.json")
+        for write_without_response in (False, True):
+            mode = "write-without-response" if write_without_response else "acknowledged"
+            menu = await measure(by_menu, rounds, write_without_response)
+            profile = await measure(by_profile, rounds, write_without_response)
+            print(f"{mode:24s} menu clicks {menu * 1000:7.1f} ms   profile {profile * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 9))
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# Encode cost per frame: hand-built bytearrays (the old write_* code) vs.
+# the protocol module's precomputed and reusable frames.
+# Usage: python benchmarks/bench_protocol.py [iterations]
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from watercooler_manager import protocol
+from watercooler_manager.enums import Commands, PumpVoltage, RGBState
+
+
+def legacy_rgb(red, green, blue, state):
+    if not all(0 <= x <= 0xff for x in (red, green, blue)) or not 0 <= state <= 0x03:
+        raise ValueError("Parameters out of range")
+    return bytearray([0xfe, Commands.RGB, 0x01, red, green, blue, state, 0xef])
+
+
+def legacy_fan(duty):
+    if not 0 <= duty <= 0xff:
+        raise ValueError("Duty cycle out of range")
+    return bytearray([0xfe, Commands.FAN, 0x01, duty, 0x00, 0x00, 0x00, 0xef])
+
+
+def legacy_pump(duty=60, voltage=PumpVoltage.V7):
+    if not 0 <= duty <= 100 or not 0 <= voltage <= 0x03:
+        raise ValueError("Parameters out of range")
+    return bytearray([0xfe, Commands.PUMP, 0x01, duty, voltage, 0x00, 0x00, 0xef])
+
+
+def legacy_reset():
+    return bytearray([0xfe, Commands.RESET, 0x00, 0x01, 0x00, 0x00, 0x00, 0xef])
+
+
+encoder = protocol.Encoder()
+CASES = [
+    ("reset", legacy_reset, protocol.reset_frame),
+    ("fan 75%", lambda: legacy_fan(75), lambda: protocol.fan_frame(75)),
+    ("pump 8V", lambda: legacy_pump(voltage=PumpVoltage.V8), lambda: protocol.pump_frame(pump_voltage=PumpVoltage.V8)),
+    ("rgb", lambda: legacy_rgb(12, 34, 56, RGBState.BREATHE), lambda: protocol.rgb_frame(12, 34, 56, RGBState.BREATHE)),
+    ("rgb (reused buffer)", lambda: legacy_rgb(12, 34, 56, RGBState.BREATHE), lambda: encoder.pack_rgb(12, 34, 56, RGBState.BREATHE)),
+]
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    print(f"{'frame':22s} {'legacy':>10s} {'protocol':>10s}")
+    for name, legacy, current in CASES:
+        assert bytes(legacy()) == bytes(current())
+        old = min(timeit.repeat(legacy, number=iterations, repeat=3)) / iterations
+        new = min(timeit.repeat(current, number=iterations, repeat=3)) / iterations
+        print(f"{name:22s} {old * 1e9:8.0f}ns {new * 1e9:8.0f}ns")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# Mean time to recover: drops the simulated cooler's link and measures how long
+# the reconnect supervisor takes to reconnect and restore the stored settings.
+# The second scenario keeps the cooler unreachable for a while first, so the
+# backoff is exercised as well.
+# Usage: python benchmarks/bench_reconnect.py [rounds]
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from watercooler_manager.device import WaterCoolingDevice
+from watercooler_manager.protocol import settings_frames
+from watercooler_manager.settings import Settings
+from watercooler_manager.simulator import SimulatedBackend, SimulatedCooler
+from watercooler_manager.supervisor import ReconnectSupervisor
+
+
+async def scenario(label, rounds, outage):
+    settings = Settings()
+    settings.fan_is_off = True
+    cooler = SimulatedCooler(seed=1)
+    device = WaterCoolingDevice(backend=SimulatedBackend([cooler]))
+    target = await device.find_device()
+    await device.connect(target.uuid)
+
+    recovered = asyncio.Event()
+    supervisor = ReconnectSupervisor(device, lambda: device.write_frames(settings_frames(settings)),
+                                     on_state=lambda connected: connected and recovered.set(),
+                                     base_delay=0.25, max_delay=2.0, seed=1)
+    supervisor.watch(target)
+
+    samples = []
+    for _ in range(rounds):
+        recovered.clear()
+        cooler.powered = not outage
+        start = time.perf_counter()
+        cooler.drop_connection()
+        if outage:
+            await asyncio.sleep(outage)
+            cooler.powered = True
+        await recovered.wait()
+        samples.append(time.perf_counter() - start)
+        if cooler.fan_on or not cooler.pump_on:
+            raise Exception("state was not restored")
+
+    supervisor.stop()
+    await device.disconnect()
+    print(f"{label:28s} mttr {statistics.mean(samples) * 1000:8.1f} ms   max {max(samples) * 1000:8.1f} ms"
+          f"   failed attempts {supervisor.failed_attempts}")
+
+
+async def run(rounds):
+    await scenario("link drop", rounds, 0.0)
+    await scenario("link drop + 1 s outage", max(1, rounds // 5), 1.0)
+
+
+if __name__ == "__main__":
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 10))
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# UI-thread time per menu click spent persisting settings: synchronous
+# writes (the old behaviour) vs. the write-behind save().
+# Usage: python benchmarks/bench_settings_save.py [clicks]
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from watercooler_manager.settings import Settings
+
+
+def click(settings: Settings, i: int):
+    settings.current_fan_speed = (25, 50, 75, 90)[i % 4]
+    settings.fan_is_off = False
+
+
+def run(clicks: int):
+    with tempfile.TemporaryDirectory() as directory:
+        Settings.CONFIG_FILE = os.path.join(directory, "watercooler.json")
+        settings = Settings()
+
+        start = time.perf_counter()
+        for i in range(clicks):
+            click(settings, i)
+            settings.save()
+            settings.flush()
+        sync = (time.perf_counter() - start) / clicks
+
+        start = time.perf_counter()
+        for i in range(clicks):
+            click(settings, i)
+            settings.save()
+        deferred = (time.perf_counter() - start) / clicks
+        settings.flush()
+
+        print(f"synchronous write:  {sync * 1e6:9.1f} µs per click")
+        print(f"write-behind save:  {deferred * 1e6:9.1f} µs per click")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# Latency of the connect-time settings transaction (pump, fan, RGB) with
+# acknowledged writes vs. pipelined write-without-response.
+#
+# Without arguments the simulated cooler is used: an acknowledged write costs
+# two connection intervals, an unacknowledged one is handed to the controller.
+# Pass a device address to measure against a real cooler instead.
+# Usage: python benchmarks/bench_settings_transaction.py [address] [rounds]
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from watercooler_manager.device import WaterCoolingDevice
+from watercooler_manager.enums import PumpVoltage, RGBState
+from watercooler_manager.protocol import pump_frame, fan_frame, rgb_frame
+from watercooler_manager.simulator import SimulatedBackend, SimulatedCooler
+
+
+FRAMES = [
+    pump_frame(pump_voltage=PumpVoltage.V8),
+    fan_frame(75),
+    rgb_frame(0, 0, 255, RGBState.BREATHE),
+]
+
+
+async def measure(device: WaterCoolingDevice, rounds: int) -> float:
+    total = 0.0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await device.write_frames(FRAMES, force=True)
+        total += time.perf_counter() - start
+    return total / rounds
+
+
+async def run(address, rounds: int):
+    if address:
+        device = WaterCoolingDevice()
+    else:
+        cooler = SimulatedCooler()
+        device = WaterCoolingDevice(backend=SimulatedBackend([cooler]))
+        address = cooler.address
+    await device.connect(address)
+
+    try:
+        for pipelined in (False, True):
+            device.write_without_response = pipelined
+            mean = await measure(device, rounds)
+            mode = "write-without-response" if pipelined else "acknowledged"
+            print(f"{mode:24s} {mean * 1000:7.1f} ms per transaction")
+        if not device.supports_write_without_response:
+            print("note: TX characteristic does not support write-without-response")
+    finally:
+        await device.disconnect()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    address = next((arg for arg in args if not arg.isdigit()), None)
+    rounds = next((int(arg) for arg in args if arg.isdigit()), 20)
+    asyncio.run(run(address, rounds))
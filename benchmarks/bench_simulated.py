@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# End-to-end timings against the in-process simulated cooler: scan-to-connected,
+# applying the stored settings (changed and unchanged), sustained command
+# throughput and reconnecting after the link drops. No hardware or Bluetooth stack needed.
+# Usage: python benchmarks/bench_simulated.py [rounds]
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from watercooler_manager.device import WaterCoolingDevice
+from watercooler_manager.protocol import settings_frames, fan_frame
+from watercooler_manager.settings import Settings
+from watercooler_manager.simulator import SimulatedBackend, SimulatedCooler
+
+THROUGHPUT_FRAMES = 200
+
+
+def report(label, samples):
+    print(f"{label:40s} median {statistics.median(samples) * 1000:8.1f} ms"
+          f"   max {max(samples) * 1000:8.1f} ms")
+
+
+async def scan_and_connect(rounds):
+    samples = []
+    for _ in range(rounds):
+        device = WaterCoolingDevice(backend=SimulatedBackend([SimulatedCooler()]))
+        start = time.perf_counter()
+        target = await device.find_device()
+        await device.connect(target.uuid)
+        samples.append(time.perf_counter() - start)
+        await device.disconnect()
+    report("scan to connected", samples)
+
+
+async def apply_settings(rounds, settings, write_without_response):
+    cooler = SimulatedCooler()
+    device = WaterCoolingDevice(write_without_response=write_without_response,
+                                backend=SimulatedBackend([cooler]))
+    await device.connect(cooler.address)
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await device.write_frames(settings_frames(settings), force=True)
+        samples.append(time.perf_counter() - start)
+    mode = "write-without-response" if write_without_response else "acknowledged"
+    report(f"apply settings ({mode})", samples)
+
+    if not write_without_response:
+        # Unchanged settings: every frame matches the shadow state and is skipped
+        samples = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            await device.write_frames(settings_frames(settings))
+            samples.append(time.perf_counter() - start)
+        report("apply settings (unchanged)", samples)
+    await device.disconnect()
+
+
+async def throughput(write_without_response):
+    cooler = SimulatedCooler()
+    device = WaterCoolingDevice(write_without_response=write_without_response,
+                                backend=SimulatedBackend([cooler]))
+    await device.connect(cooler.address)
+    start = time.perf_counter()
+    for i in range(THROUGHPUT_FRAMES):
+        await device.write_buffer(fan_frame(i % 101))
+    elapsed = time.perf_counter() - start
+    await device.disconnect()
+    mode = "write-without-response" if write_without_response else "acknowledged"
+    print(f"{'throughput (' + mode + ')':40s} {THROUGHPUT_FRAMES / elapsed:8.1f} frames/s")
+
+
+async def reconnect(rounds):
+    cooler = SimulatedCooler()
+    device = WaterCoolingDevice(backend=SimulatedBackend([cooler]))
+    target = await device.find_device()
+    await device.connect(target.uuid)
+    samples = []
+    for _ in range(rounds):
+        cooler.drop_connection()
+        start = time.perf_counter()
+        if await device.connect_first([target]) is None:
+            raise Exception("reconnect failed")
+        samples.append(time.perf_counter() - start)
+    await device.disconnect()
+    report("reconnect after drop", samples)
+
+
+async def run(rounds):
+    settings = Settings()
+    await scan_and_connect(rounds)
+    await apply_settings(rounds, settings, False)
+    await apply_settings(rounds, settings, True)
+    await throughput(False)
+    await throughput(True)
+    await reconnect(rounds)
+
+
+if __name__ == "__main__":
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 10))
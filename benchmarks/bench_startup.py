@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# Startup cost: package import time in a fresh interpreter, and time from
+# interpreter start to the tray icon being visible (needs a desktop session).
+# Usage: python benchmarks/bench_startup.py [runs] [--no-tray]
+
+import os
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+IMPORT_SNIPPET = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = [name for name in ("bleak", "pystray", "PIL", "winshell") if name in sys.modules]
+print(elapsed, ",".join(heavy))
+"""
+
+TRAY_SNIPPET = """
+import time
+start = time.perf_counter()
+from watercooler_manager import WaterCoolerManager, __version__
+
+app = WaterCoolerManager(version=__version__)
+app.tray.setup()
+
+def visible(icon):
+    icon.visible = True
+    print(time.perf_counter() - start)
+    icon.stop()
+
+app.tray.icon.run(setup=visible)
+"""
+
+
+def run_python(code: str) -> str:
+    env = dict(os.environ, PYTHONPATH=SRC)
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+def measure_import(module: str, runs: int):
+    times = []
+    heavy = ""
+    for _ in range(runs):
+        elapsed, _, heavy = run_python(IMPORT_SNIPPET.format(module=module)).partition(" ")
+        times.append(float(elapsed))
+    print(f"import {module:32s} {min(times) * 1000:7.1f} ms  heavy modules: {heavy or 'none'}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    runs = next((int(arg) for arg in args if arg.isdigit()), 5)
+    for module in ("watercooler_manager", "watercooler_manager.device", "watercooler_manager.app"):
+        measure_import(module, runs)
+
+    if "--no-tray" not in args:
+        try:
+            times = [float(run_python(TRAY_SNIPPET)) for _ in range(runs)]
+            print(f"{'start to tray visible':39s} {min(times) * 1000:7.1f} ms")
+        except subprocess.CalledProcessError as e:
+            print(f"tray could not be shown: {e.stderr.strip().splitlines()[-1]}")
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# Cost of one temperature sample and curve evaluation, against a fake sysfs
+# tree (or the real one with --real).
+# Usage: python benchmarks/bench_thermal.py [--real] [samples]
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from watercooler_manager.thermal import ThermalCurve, ThermalSensors
+
+
+def fake_sysfs(root: str):
+    zones = {"thermal_zone0": ("acpitz", 41000), "thermal_zone1": ("x86_pkg_temp", 67500)}
+    for zone, (label, temp) in zones.items():
+        path = os.path.join(root, "sys/class/thermal", zone)
+        os.makedirs(path)
+        with open(os.path.join(path, "type"), "w") as f:
+            f.write(label + "\n")
+        with open(os.path.join(path, "temp"), "w") as f:
+            f.write(f"{temp}\n")
+
+    hwmons = {"hwmon0": ("coretemp", [62000, 64000, 66000, 71000]), "hwmon1": ("amdgpu", [58000])}
+    for hwmon, (label, temps) in hwmons.items():
+        path = os.path.join(root, "sys/class/hwmon", hwmon)
+        os.makedirs(path)
+        with open(os.path.join(path, "name"), "w") as f:
+            f.write(label + "\n")
+        for i, temp in enumerate(temps, 1):
+            with open(os.path.join(path, f"temp{i}_input"), "w") as f:
+                f.write(f"{temp}\n")
+
+
+def run(sensors: ThermalSensors, samples: int):
+    curve = ThermalCurve()
+    level = None
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    for _ in range(samples):
+        level = curve.level_for(sensors.max_temperature(), level)
+    wall = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+
+    print(f"sensors:        {', '.join(sensors.sensors)}")
+    print(f"max temp:       {sensors.max_temperature():.1f} °C -> {curve.target(level)}")
+    print(f"per sample:     {wall / samples * 1e6:.1f} µs wall, {cpu / samples * 1e6:.1f} µs cpu")
+    print(f"CPU at 10 Hz:   {cpu / samples * 10 * 100:.4f} %")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    samples = next((int(arg) for arg in args if arg.isdigit()), 10000)
+    if "--real" in args:
+        sensors = ThermalSensors()
+        if not sensors.available:
+            sys.exit("no CPU/GPU temperature sensors found")
+        run(sensors, samples)
+    else:
+        with tempfile.TemporaryDirectory() as root:
+            fake_sysfs(root)
+            sensors = ThermalSensors(root)
+            run(sensors, samples)
+            sensors.close()
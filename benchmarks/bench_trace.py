@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# Cost of recording a frame into the memory-mapped trace, then a recorded
+# session (an RGB animation plus a few fan changes on the simulated cooler)
+# replayed through a fresh simulated link at several speeds.
+# Usage: python benchmarks/bench_trace.py [record_calls]
+
+import asyncio
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from watercooler_manager.animation import Animator, gradient
+from watercooler_manager.device import WaterCoolingDevice
+from watercooler_manager.protocol import fan_frame
+from watercooler_manager.simulator import SimulatedBackend, SimulatedCooler
+from watercooler_manager.trace import TraceRecorder, read_traces, replay
+
+SPEEDS = (1.0, 4.0, 0.0)
+
+
+def record_cost(directory, calls):
+    recorder = TraceRecorder(os.path.join(directory, "cost.trace"), max_bytes=4 << 20)
+    frame = fan_frame(50)
+    per_call = timeit.timeit(lambda: recorder.record(0, frame), number=calls) / calls
+    recorder.close()
+    print(f"{'TraceRecorder.record':28s} {per_call * 1e9:8.0f} ns per frame ({recorder.rotations} rotations)")
+
+
+async def record_session(path):
+    cooler = SimulatedCooler()
+    device = WaterCoolingDevice(write_without_response=True, backend=SimulatedBackend([cooler]))
+    device.trace = TraceRecorder(path)
+    await device.connect(cooler.address, name=cooler.name)
+    animator = Animator(device, fps=30)
+    animator.play(gradient([(255, 0, 0), (0, 0, 255)]))
+    for speed in (25, 50, 75, 90):
+        await asyncio.sleep(0.5)
+        await device.write_fan_mode(speed)
+    animator.stop()
+    await device.disconnect()
+    device.trace.close()
+
+
+async def run(calls):
+    with tempfile.TemporaryDirectory() as directory:
+        record_cost(directory, calls)
+
+        path = os.path.join(directory, "session.trace")
+        await record_session(path)
+        records = list(read_traces(path))
+        print(f"recorded session: {len(records)} records")
+
+        for speed in SPEEDS:
+            backend = SimulatedBackend()
+            link = backend.link(backend.coolers[0].address)
+            await link.connect()
+            sent, elapsed, late = await replay(link, records, speed)
+            await link.disconnect()
+            label = f"replay x{speed:g}" if speed else "replay unpaced"
+            print(f"{label:28s} {sent} frames in {elapsed * 1000:7.1f} ms "
+                  f"({sent / elapsed:6.1f} frames/s), worst lateness {late * 1000:6.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 200000))
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# Time per tray connection-status update: re-reading the PNG and rebuilding
+# the whole menu (the old behaviour) vs. cached icons and update_menu().
+# Runs on pystray's dummy backend, so native menu work is not included.
+# Usage: python benchmarks/bench_tray.py [updates]
+
+import os
+import sys
+import time
+
+os.environ.setdefault("PYSTRAY_BACKEND", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pystray
+from PIL import Image
+
+from watercooler_manager import WaterCoolerManager
+from watercooler_manager.tray import ICON_DIR
+
+
+class HeadlessIcon(pystray.Icon):
+    def _update_icon(self):
+        pass
+
+    def _update_menu(self):
+        pass
+
+
+def legacy_update(tray, connected: bool):
+    tray.connected = connected
+    tray.icon.icon = Image.open(os.path.join(ICON_DIR, "connected.png" if connected else "disconnected.png"))
+    tray._menu = None
+    tray.icon.menu = tray.create_menu()
+
+
+def run(updates: int):
+    app = WaterCoolerManager()
+    tray = app.tray
+    tray.icon = HeadlessIcon("WaterCooler", tray.create_icon_image(), "Water Cooler Manager", tray.create_menu())
+
+    start = time.perf_counter()
+    for i in range(updates):
+        legacy_update(tray, i % 2 == 0)
+    legacy = (time.perf_counter() - start) / updates
+
+    start = time.perf_counter()
+    for i in range(updates):
+        tray.update_connection_status(i % 2 == 0)
+    cached = (time.perf_counter() - start) / updates
+
+    print(f"reload icon + rebuild menu:  {legacy * 1e6:9.1f} µs per update")
+    print(f"cached icon + update_menu:   {cached * 1e6:9.1f} µs per update")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
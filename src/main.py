@@ -1,11 +1,22 @@
 #!/usr/bin/env python3
 
+import sys
 
-from watercooler_manager import WaterCoolerManager, __version__
+from watercooler_manager import __version__
 
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "daemon":
+        from watercooler_manager.daemon import main as daemon_main
+        daemon_main(sys.argv[2:])
+        return
+    if len(sys.argv) > 1:
+        from watercooler_manager.cli import main as cli_main
+        sys.exit(cli_main(sys.argv[1:]))
+
+    # Only the tray application needs app.py and everything it imports
+    from watercooler_manager import WaterCoolerManager
     app = WaterCoolerManager(version=__version__)
     app.run()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
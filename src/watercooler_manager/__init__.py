@@ -2,7 +2,12 @@
 Water Cooler Manager - A system tray application to control LCT water cooling devices
 """
 
-from .app import WaterCoolerManager
-
 __version__ = "1.2.0"
-__all__ = ['WaterCoolerManager'] 
\ No newline at end of file
+__all__ = ['WaterCoolerManager']
+
+def __getattr__(name):
+    # Loading the tray application (pystray, PIL) is deferred until it is used
+    if name == 'WaterCoolerManager':
+        from .app import WaterCoolerManager
+        return WaterCoolerManager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
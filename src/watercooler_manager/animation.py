@@ -0,0 +1,125 @@
+import asyncio
+import math
+from typing import Callable, Optional, Sequence, Tuple
+from .enums import RGBState
+from .protocol import rgb_frame
+
+Color = Tuple[int, int, int]
+
+class Palette:
+    # An effect rendered ahead of time: one ready-to-send RGB frame per step,
+    # so a tick is a tuple lookup and never builds or allocates a frame
+    def __init__(self, colors: Sequence[Color], loop: bool = True):
+        self.frames: Tuple[bytes, ...] = tuple(rgb_frame(*color, RGBState.STATIC) for color in colors)
+        self.loop = loop
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+def _mix(a: Color, b: Color, t: float) -> Color:
+    return tuple(round(x + (y - x) * t) for x, y in zip(a, b))
+
+def _scale(color: Color, brightness: float) -> Color:
+    return tuple(round(x * brightness) for x in color)
+
+def gradient(colors: Sequence[Color], steps: int = 32) -> Palette:
+    # Fades through the colors and back to the first one
+    return Palette([_mix(colors[i], colors[(i + 1) % len(colors)], step / steps)
+                    for i in range(len(colors)) for step in range(steps)])
+
+def pulse(color: Color, steps: int = 64, floor: float = 0.05) -> Palette:
+    return Palette([_scale(color, floor + (1 - floor) * math.sin(math.pi * step / steps) ** 2)
+                    for step in range(steps)])
+
+def flash(color: Color, times: int = 3, on: int = 6, off: int = 6) -> Palette:
+    # Plays once; the animator then writes whatever it was given as `after`
+    return Palette(([color] * on + [(0, 0, 0)] * off) * times, loop=False)
+
+def levels(low: Color, high: Color, steps: int = 64) -> Palette:
+    # Indexed by a 0..1 level rather than played in order, see Animator.follow()
+    return Palette([_mix(low, high, step / (steps - 1)) for step in range(steps)])
+
+class Animator:
+    # Streams palette frames to the device at a target rate. Writes are awaited
+    # one at a time; ticks that pass while a write is in flight are dropped, so
+    # a slow link shows the current frame late rather than a backlog of old ones.
+    def __init__(self, device, fps: float = 30.0):
+        self.device = device
+        self.fps = fps
+        self.sent = 0
+        # Ticks whose frame the cooler already showed, skipped by the device's shadow check
+        self.suppressed = 0
+        self.dropped = 0
+        self.failed = 0
+        self.elapsed = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def achieved_fps(self) -> float:
+        return self.sent / self.elapsed if self.elapsed else 0.0
+
+    def play(self, palette: Palette, fps: Optional[float] = None, after: Optional[bytes] = None):
+        frames = palette.frames
+        count = len(frames)
+        if palette.loop:
+            pick = lambda tick: frames[tick % count]
+        else:
+            pick = lambda tick: frames[tick] if tick < count else None
+        self._start(pick, fps, after)
+
+    def follow(self, palette: Palette, level: Callable[[], float], fps: Optional[float] = None):
+        # Shows the palette entry for level() on every tick, e.g. CPU load or temperature
+        frames = palette.frames
+        top = len(frames) - 1
+        self._start(lambda tick: frames[round(min(max(level(), 0.0), 1.0) * top)], fps, None)
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def wait(self):
+        if self._task is not None:
+            try:
+                await asyncio.shield(self._task)
+            except asyncio.CancelledError:
+                pass
+
+    def _start(self, pick: Callable[[int], Optional[bytes]], fps: Optional[float], after: Optional[bytes]):
+        self.stop()
+        self.sent = self.suppressed = self.dropped = self.failed = 0
+        self.elapsed = 0.0
+        self._task = asyncio.get_running_loop().create_task(self._run(pick, fps or self.fps, after))
+
+    async def _run(self, pick: Callable[[int], Optional[bytes]], fps: float, after: Optional[bytes]):
+        loop = asyncio.get_running_loop()
+        period = 1.0 / fps
+        start = loop.time()
+        tick = 0
+        while True:
+            frame = pick(tick)
+            if frame is None:
+                break
+            try:
+                suppressed = self.device.suppressed
+                await self.device.write_buffer(frame, response=False)
+                if self.device.suppressed != suppressed:
+                    self.suppressed += 1
+                else:
+                    self.sent += 1
+            except Exception:
+                self.failed += 1
+            due = int((loop.time() - start) / period) + 1
+            self.dropped += due - tick - 1
+            tick = due
+            self.elapsed = tick * period
+            await asyncio.sleep(start + tick * period - loop.time())
+        if after is not None:
+            try:
+                await self.device.write_buffer(after)
+            except Exception:
+                self.failed += 1
@@ -1,19 +1,29 @@
 import asyncio
 import threading
+import time
 from .device import WaterCoolingDevice
+from .protocol import settings_frames
 from .settings import Settings
+from .cache import DeviceCache
+from .thermal import ThermalController
+from .supervisor import ReconnectSupervisor
 from .tray import SystemTrayIcon
 from .enums import PumpVoltage, RGBState
-import pystray
+from .models import PUMP_VOLTAGE_PRESETS, FAN_SPEED_PRESETS, RGB_MODE_PRESETS, RGB_COLOR_PRESETS
 
 class WaterCoolerManager:
     def __init__(self, version=None):
         self.settings = Settings()
         self.device = WaterCoolingDevice()
+        self.device_cache = DeviceCache()
+        self.thermal = ThermalController(self.device)
+        self.supervisor = ReconnectSupervisor(self.device, self.apply_current_settings,
+                                              on_state=self._on_link_state)
         self.loop = asyncio.new_event_loop()
         self.tray = SystemTrayIcon(
             on_connect=self.connect_menu,
             on_disconnect=self.disconnect_menu,
+            on_profile_settings=self.handle_profile_settings,
             on_pump_settings=self.handle_pump_settings,
             on_fan_settings=self.handle_fan_settings,
             on_rgb_settings=self.handle_rgb_settings,
@@ -23,6 +33,7 @@ class WaterCoolerManager:
             settings=self.settings,
             version=version if version is not None else "v1.0.0"
         )
+        self.settings.on_error = lambda e: self.tray.show_notification(f"Failed to save settings: {str(e)}")
 
     def run(self):
         # Setup and start the event loop in a separate thread
@@ -43,40 +54,51 @@ class WaterCoolerManager:
         self.tray.run()
 
     def exit_app(self):
+        self.loop.call_soon_threadsafe(self.supervisor.stop)
+        self.loop.call_soon_threadsafe(self.thermal.stop)
         future = asyncio.run_coroutine_threadsafe(self.device.disconnect(), self.loop)
         try:
             future.result(2)
         except Exception:
             pass
         self.loop.call_soon_threadsafe(self.loop.stop)
-        self.settings.save()
+        self.settings.flush()
         self.tray.stop()
 
     def connect_menu(self):
         asyncio.run_coroutine_threadsafe(self.connect_and_run(), self.loop)
 
     def disconnect_menu(self):
+        self.loop.call_soon_threadsafe(self.supervisor.stop)
+        self.loop.call_soon_threadsafe(self.thermal.stop)
         asyncio.run_coroutine_threadsafe(self.device.disconnect(), self.loop)
         self.tray.update_connection_status(False)
 
     async def connect_and_run(self):
-        self.tray.show_notification("Scanning for CoolingSystem device...")
-        devices = await self.device.get_device_list()
-        
-        if not devices:
-            self.tray.show_notification("CoolingSystem device not found")
-            return
+        self.supervisor.stop()
+        target_device = await self._connect_cached()
+
+        if target_device is None:
+            self.tray.show_notification("Scanning for CoolingSystem device...")
+            target_device = await self.device.find_device()
 
-        target_device = devices[0]
-        self.tray.show_notification(f"Found device at {target_device.uuid}")
+            if target_device is None:
+                self.tray.show_notification("CoolingSystem device not found")
+                return
+
+            self.tray.show_notification(f"Found device at {target_device.uuid}")
         
         try:
-            await self.device.connect(target_device.uuid)
+            if not await self.device.is_connected():
+                await self.device.connect(target_device.uuid)
+            self.device_cache.remember(target_device)
+            self.device_cache.save()
             self.tray.show_notification(f"Successfully connected to {target_device.name}")
             self.tray.update_connection_status(True)
             
             # Apply current settings
             await self.apply_current_settings()
+            self.supervisor.watch(target_device)
             
         except Exception as e:
             self.tray.show_notification(f"Error occurred: {str(e)}")
@@ -84,71 +106,83 @@ class WaterCoolerManager:
                 await self.device.disconnect()
             self.tray.update_connection_status(False)
 
+    def _on_link_state(self, connected: bool):
+        if connected:
+            self.tray.show_notification(f"Reconnected to {self.supervisor.target.name}")
+        else:
+            self.thermal.stop()
+            self.tray.show_notification("Connection lost, reconnecting...")
+        self.tray.update_connection_status(connected)
+
+    async def _connect_cached(self):
+        # Try known coolers by address first; only scan if none of them answers
+        return await self.device.connect_first(self.device_cache.fresh())
+
     async def apply_current_settings(self):
-        await self.device.write_pump_mode(pump_voltage=self.settings.current_voltage)
-        await self.device.write_fan_mode(self.settings.current_fan_speed)
-        if not self.settings.rgb_is_off:
-            await self.device.write_rgb(*self.settings.rgb_color, self.settings.rgb_state)
+        await self.device.write_frames(settings_frames(self.settings))
+        if self.settings.auto_thermal:
+            self.thermal.start()
+
+    def handle_profile_settings(self):
+        import pystray
+        menu = pystray.Menu(*(
+            pystray.MenuItem(name, self._action(self._apply_profile, name),
+                           checked=lambda _, n=name: self.settings.active_profile() == n)
+            for name in self.settings.profiles
+        ))
+        return menu
 
     def handle_pump_settings(self):
+        import pystray
         menu = pystray.Menu(
             pystray.MenuItem('Turn Off', self._toggle_pump,
                            checked=lambda _: self.settings.pump_is_off),
-            pystray.MenuItem('Voltage', pystray.Menu(
-                pystray.MenuItem('7V', lambda: self._set_pump_voltage(PumpVoltage.V7),
-                               checked=lambda _: not self.settings.pump_is_off and self.settings.current_voltage == PumpVoltage.V7),
-                pystray.MenuItem('8V', lambda: self._set_pump_voltage(PumpVoltage.V8),
-                               checked=lambda _: not self.settings.pump_is_off and self.settings.current_voltage == PumpVoltage.V8),
-                pystray.MenuItem('11V', lambda: self._set_pump_voltage(PumpVoltage.V11),
-                               checked=lambda _: not self.settings.pump_is_off and self.settings.current_voltage == PumpVoltage.V11)                
-            ))
+            pystray.MenuItem('Voltage', pystray.Menu(*(
+                pystray.MenuItem(label, self._action(self._set_pump_voltage, voltage),
+                               checked=lambda _, v=voltage: not self.settings.pump_is_off and self.settings.current_voltage == v)
+                for voltage, label in PUMP_VOLTAGE_PRESETS
+            )))
         )
         return menu
 
     def handle_fan_settings(self):
+        import pystray
         menu = pystray.Menu(
             pystray.MenuItem('Turn Off', self._toggle_fan,
                            checked=lambda _: self.settings.fan_is_off),
-            pystray.MenuItem('Speed', pystray.Menu(
-                pystray.MenuItem('25%', lambda: self._set_fan_speed(25),
-                               checked=lambda _: not self.settings.fan_is_off and self.settings.current_fan_speed == 25),
-                pystray.MenuItem('50%', lambda: self._set_fan_speed(50),
-                               checked=lambda _: not self.settings.fan_is_off and self.settings.current_fan_speed == 50),
-                pystray.MenuItem('75%', lambda: self._set_fan_speed(75),
-                               checked=lambda _: not self.settings.fan_is_off and self.settings.current_fan_speed == 75),
-                pystray.MenuItem('90%', lambda: self._set_fan_speed(90),
-                               checked=lambda _: not self.settings.fan_is_off and self.settings.current_fan_speed == 90)
-            ))
+            pystray.MenuItem('Automatic (temperature)', self._toggle_thermal,
+                           checked=lambda _: self.settings.auto_thermal,
+                           visible=self.thermal.sensors.available),
+            pystray.MenuItem('Speed', pystray.Menu(*(
+                pystray.MenuItem(f'{speed}%', self._action(self._set_fan_speed, speed),
+                               checked=lambda _, s=speed: not self.settings.fan_is_off and self.settings.current_fan_speed == s)
+                for speed in FAN_SPEED_PRESETS
+            )))
         )
         return menu
 
     def handle_rgb_settings(self):
+        import pystray
         menu = pystray.Menu(
             pystray.MenuItem('Turn Off', self._toggle_rgb,
                            checked=lambda _: self.settings.rgb_is_off),
-            pystray.MenuItem('Mode', pystray.Menu(
-                pystray.MenuItem('Static', lambda: self._set_rgb_mode(RGBState.STATIC),
-                               checked=lambda _: not self.settings.rgb_is_off and self.settings.rgb_state == RGBState.STATIC),
-                pystray.MenuItem('Breathe', lambda: self._set_rgb_mode(RGBState.BREATHE),
-                               checked=lambda _: not self.settings.rgb_is_off and self.settings.rgb_state == RGBState.BREATHE),
-                pystray.MenuItem('Rainbow', lambda: self._set_rgb_mode(RGBState.COLORFUL),
-                               checked=lambda _: not self.settings.rgb_is_off and self.settings.rgb_state == RGBState.COLORFUL),
-                pystray.MenuItem('Breathe Rainbow', lambda: self._set_rgb_mode(RGBState.BREATHE_COLOR),
-                               checked=lambda _: not self.settings.rgb_is_off and self.settings.rgb_state == RGBState.BREATHE_COLOR)
-            )),
-            pystray.MenuItem('Color', pystray.Menu(
-                pystray.MenuItem('Red', lambda: self._set_rgb_color(255, 0, 0),
-                               checked=lambda _: not self.settings.rgb_is_off and self.settings.rgb_color == (255, 0, 0)),
-                pystray.MenuItem('Green', lambda: self._set_rgb_color(0, 255, 0),
-                               checked=lambda _: not self.settings.rgb_is_off and self.settings.rgb_color == (0, 255, 0)),
-                pystray.MenuItem('Blue', lambda: self._set_rgb_color(0, 0, 255),
-                               checked=lambda _: not self.settings.rgb_is_off and self.settings.rgb_color == (0, 0, 255)),
-                pystray.MenuItem('White', lambda: self._set_rgb_color(255, 255, 255),
-                               checked=lambda _: not self.settings.rgb_is_off and self.settings.rgb_color == (255, 255, 255))
-            ))
+            pystray.MenuItem('Mode', pystray.Menu(*(
+                pystray.MenuItem(label, self._action(self._set_rgb_mode, state),
+                               checked=lambda _, s=state: not self.settings.rgb_is_off and self.settings.rgb_state == s)
+                for state, label in RGB_MODE_PRESETS
+            ))),
+            pystray.MenuItem('Color', pystray.Menu(*(
+                pystray.MenuItem(label, self._action(self._set_rgb_color, *color),
+                               checked=lambda _, c=color: not self.settings.rgb_is_off and self.settings.rgb_color == c)
+                for color, label in RGB_COLOR_PRESETS
+            )))
         )
         return menu
 
+    @staticmethod
+    def _action(handler, *args):
+        return lambda: handler(*args)
+
     def handle_autostart_settings(self):
         self.settings.set_autostart(not self.settings.auto_start)
 
@@ -156,71 +190,93 @@ class WaterCoolerManager:
         self.settings.auto_connect = not self.settings.auto_connect
         self.settings.save()
 
+    def _run_command(self, coro):
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        future.add_done_callback(self._on_command_done)
+        return future
+
+    def _on_command_done(self, future):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            self.tray.show_notification(f"Command failed: {str(error)}")
+
+    def _toggle_thermal(self):
+        self.settings.auto_thermal = not self.settings.auto_thermal
+        if self.settings.auto_thermal:
+            self._run_command(self._start_thermal())
+        else:
+            self.loop.call_soon_threadsafe(self.thermal.stop)
+            self._run_command(self.apply_current_settings())
+        self.settings.save()
+
+    async def _start_thermal(self):
+        # While disconnected, apply_current_settings() starts it after the next connect
+        if await self.device.is_connected():
+            self.thermal.start()
+
+    def _disable_thermal(self):
+        # A manual fan or pump choice takes over from the automatic mode
+        if self.settings.auto_thermal:
+            self.settings.auto_thermal = False
+            self.loop.call_soon_threadsafe(self.thermal.stop)
+
+    def _apply_profile(self, name: str):
+        started = time.perf_counter()
+        self._disable_thermal()
+        profile = self.settings.apply_profile(name)
+        self._run_command(self.device.apply_profile(profile, started))
+        self.settings.save()
+
     def _toggle_pump(self):
+        self._disable_thermal()
         self.settings.pump_is_off = not self.settings.pump_is_off
         if self.settings.pump_is_off:
-            asyncio.run_coroutine_threadsafe(self.device.write_pump_off(), self.loop)
+            self._run_command(self.device.write_pump_off())
         else:
-            asyncio.run_coroutine_threadsafe(
-                self.device.write_pump_mode(pump_voltage=self.settings.current_voltage), 
-                self.loop
-            )
+            self._run_command(self.device.write_pump_mode(pump_voltage=self.settings.current_voltage))
         self.settings.save()
 
     def _set_pump_voltage(self, voltage: PumpVoltage):
+        self._disable_thermal()
         self.settings.current_voltage = voltage
         self.settings.pump_is_off = False
-        asyncio.run_coroutine_threadsafe(
-            self.device.write_pump_mode(pump_voltage=voltage),
-            self.loop
-        )
+        self._run_command(self.device.write_pump_mode(pump_voltage=voltage))
         self.settings.save()
 
     def _toggle_fan(self):
+        self._disable_thermal()
         self.settings.fan_is_off = not self.settings.fan_is_off
         if self.settings.fan_is_off:
-            asyncio.run_coroutine_threadsafe(self.device.write_fan_off(), self.loop)
+            self._run_command(self.device.write_fan_off())
         else:
-            asyncio.run_coroutine_threadsafe(
-                self.device.write_fan_mode(self.settings.current_fan_speed),
-                self.loop
-            )
+            self._run_command(self.device.write_fan_mode(self.settings.current_fan_speed))
         self.settings.save()
 
     def _set_fan_speed(self, speed: int):
+        self._disable_thermal()
         self.settings.current_fan_speed = speed
         self.settings.fan_is_off = False
-        asyncio.run_coroutine_threadsafe(
-            self.device.write_fan_mode(speed),
-            self.loop
-        )
+        self._run_command(self.device.write_fan_mode(speed))
         self.settings.save()
 
     def _toggle_rgb(self):
         self.settings.rgb_is_off = not self.settings.rgb_is_off
         if self.settings.rgb_is_off:
-            asyncio.run_coroutine_threadsafe(self.device.write_rgb_off(), self.loop)
+            self._run_command(self.device.write_rgb_off())
         else:
-            asyncio.run_coroutine_threadsafe(
-                self.device.write_rgb(*self.settings.rgb_color, self.settings.rgb_state),
-                self.loop
-            )
+            self._run_command(self.device.write_rgb(*self.settings.rgb_color, self.settings.rgb_state))
         self.settings.save()
 
     def _set_rgb_mode(self, state: RGBState):
         self.settings.rgb_state = state
         self.settings.rgb_is_off = False
-        asyncio.run_coroutine_threadsafe(
-            self.device.write_rgb(*self.settings.rgb_color, state),
-            self.loop
-        )
+        self._run_command(self.device.write_rgb(*self.settings.rgb_color, state))
         self.settings.save()
 
     def _set_rgb_color(self, red: int, green: int, blue: int):
         self.settings.rgb_color = (red, green, blue)
         self.settings.rgb_is_off = False
-        asyncio.run_coroutine_threadsafe(
-            self.device.write_rgb(red, green, blue, self.settings.rgb_state),
-            self.loop
-        )
+        self._run_command(self.device.write_rgb(red, green, blue, self.settings.rgb_state))
         self.settings.save()
\ No newline at end of file
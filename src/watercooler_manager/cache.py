@@ -0,0 +1,100 @@
+import os
+import json
+import time
+import platform
+from typing import Dict, List
+from .models import DeviceInfo
+from .settings import write_file_atomic
+
+class DeviceCache:
+    REGISTRY_KEY = r"Software\WaterCooler"
+    CACHE_FILE = os.path.expanduser("~/.watercooler_devices.json")
+    DEFAULT_TTL = 30 * 24 * 60 * 60
+
+    def __init__(self, ttl: float = DEFAULT_TTL):
+        self.ttl = ttl
+        self.devices: Dict[str, DeviceInfo] = {}
+        self.load()
+
+    def remember(self, info: DeviceInfo):
+        info.last_seen = time.time()
+        self.devices[info.uuid] = info
+
+    def forget(self, address: str):
+        self.devices.pop(address, None)
+
+    def fresh(self) -> List[DeviceInfo]:
+        # Most recently seen first; expired entries are never tried
+        cutoff = time.time() - self.ttl
+        devices = [info for info in self.devices.values() if info.last_seen >= cutoff]
+        return sorted(devices, key=lambda info: info.last_seen, reverse=True)
+
+    def load(self):
+        if platform.system() == 'Windows':
+            self._load_from_registry()
+        else:
+            self._load_from_file()
+
+    def save(self):
+        if platform.system() == 'Windows':
+            self._save_to_registry()
+        else:
+            self._save_to_file()
+
+    def _to_json(self) -> str:
+        return json.dumps([
+            {
+                'address': info.uuid,
+                'name': info.name,
+                'model': info.model,
+                'rssi': info.rssi,
+                'last_seen': info.last_seen,
+                'adapter': info.adapter
+            }
+            for info in self.devices.values()
+        ])
+
+    def _from_json(self, data: str):
+        devices = {}
+        for entry in json.loads(data):
+            info = DeviceInfo()
+            info.uuid = entry['address']
+            info.name = entry['name']
+            info.model = entry['model']
+            info.rssi = entry['rssi']
+            info.last_seen = entry['last_seen']
+            info.adapter = entry.get('adapter')
+            devices[info.uuid] = info
+        self.devices = devices
+
+    def _load_from_registry(self):
+        try:
+            import winreg
+            key = winreg.CreateKey(winreg.HKEY_CURRENT_USER, self.REGISTRY_KEY)
+            self._from_json(winreg.QueryValueEx(key, "known_devices")[0])
+            winreg.CloseKey(key)
+        except:
+            pass
+
+    def _save_to_registry(self):
+        try:
+            import winreg
+            key = winreg.CreateKey(winreg.HKEY_CURRENT_USER, self.REGISTRY_KEY)
+            winreg.SetValueEx(key, "known_devices", 0, winreg.REG_SZ, self._to_json())
+            winreg.CloseKey(key)
+        except:
+            pass
+
+    def _load_from_file(self):
+        try:
+            with open(self.CACHE_FILE, 'r') as f:
+                self._from_json(f.read())
+        except:
+            pass
+
+    def _save_to_file(self):
+        try:
+            write_file_atomic(self.CACHE_FILE, self._to_json())
+        except OSError:
+            # Without the cache the next start scans; nothing else depends on it
+            pass
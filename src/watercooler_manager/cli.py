@@ -0,0 +1,97 @@
+import os
+import sys
+import json
+import socket
+import argparse
+import tempfile
+from typing import List, Optional
+
+# Kept here rather than in daemon.py so the client does not import asyncio or bleak
+SOCKET_PATH = os.path.join(os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir(), "watercooler.sock")
+
+def send(requests: List[dict], socket_path: str = SOCKET_PATH, timeout: float = 30.0) -> List[dict]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall(b"".join(json.dumps(request).encode() + b"\n" for request in requests))
+        reader = sock.makefile("rb")
+        return [json.loads(reader.readline()) for _ in requests]
+
+def _parse_command(tokens: List[str]) -> dict:
+    # "fan 50", "fan off", "pump 8V", "rgb red breathe", "rgb 0,0,255", "rgb off",
+    # "animate gradient red blue 60", "animate off", "profile quiet", "profile save Gaming"
+    command, args = tokens[0], tokens[1:]
+    request = {"cmd": command}
+    if command == "profile":
+        if not args or args[0] == "list":
+            request["action"], args = "list", []
+        elif args[0] in ("save", "delete"):
+            request["action"], args = args[0], args[1:]
+            if not args:
+                raise ValueError(f"profile {request['action']} needs a name")
+        request["name"] = " ".join(args)
+    elif command == "animate":
+        request["effect"] = args[0] if args else "gradient"
+        request["colors"] = []
+        for arg in args[1:]:
+            if arg.isdigit():
+                request["fps"] = int(arg)
+            else:
+                request["colors"].append(arg)
+    elif args and args[0] == "off":
+        request["off"] = True
+    elif command == "fan" and args:
+        if not args[0].isdigit():
+            raise ValueError(f"fan speed must be a number from 0 to 100, not {args[0]!r}")
+        request["speed"] = int(args[0])
+    elif command == "pump" and args:
+        request["voltage"] = args[0]
+    elif command == "rgb":
+        for arg in args:
+            if arg.upper() in ("STATIC", "BREATHE", "COLORFUL", "BREATHE_COLOR"):
+                request["mode"] = arg
+            else:
+                request["color"] = arg
+    return request
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="watercooler", description="Control a running watercooler daemon")
+    parser.add_argument("--socket", default=SOCKET_PATH)
+    parser.add_argument("--force", action="store_true",
+                        help="Send the frames even if the cooler is believed to be in that state already")
+    parser.add_argument("command", nargs="+",
+                        help="status | connect | disconnect | fan N|off | pump 7V|8V|11V|12V|off | "
+                             "rgb [COLOR|R,G,B] [MODE]|off | profile list|[save|delete] NAME | "
+                             "animate gradient|pulse|flash|load|off [COLOR ...] [FPS]. Separate several commands with '+' "
+                             "to send them as one batch")
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    groups = [[]]
+    for token in args.command:
+        if token == "+":
+            groups.append([])
+        else:
+            groups[-1].append(token)
+    try:
+        commands = [_parse_command(group) for group in groups if group]
+    except ValueError as e:
+        parser.error(str(e))
+    request = commands[0] if len(commands) == 1 else {"cmd": "batch", "commands": commands}
+    if args.force:
+        request["force"] = True
+
+    try:
+        response = send([request], args.socket)[0]
+    except OSError as e:
+        print(f"Cannot reach daemon at {args.socket}: {e}", file=sys.stderr)
+        return 2
+
+    print(json.dumps(response, indent=2))
+    return 0 if response.get("ok") else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+from .enums import Commands
+
+
+class PendingFrame:
+    def __init__(self, data: bytes, response: bool = True, delay: float = 0.0):
+        self.data = data
+        self.response = response
+        self.delay = delay
+        self.waiters: List[asyncio.Future] = []
+        self.submitted_at: List[float] = []
+
+
+# Single writer per device. Pending frames of the same command type are
+# collapsed to the latest one, so a burst of clicks costs one GATT write.
+class CommandQueue:
+    def __init__(self, write: Callable[[bytes, bool], Awaitable[None]], maxsize: int = 8):
+        self._write = write
+        self.maxsize = maxsize
+        self._pending: Dict[int, PendingFrame] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: Optional[int] = None
+
+        self.submitted = 0
+        self.sent = 0
+        self.coalesced = 0
+        self.failed = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.latency_count = 0
+
+    @staticmethod
+    def is_priority(data: bytes) -> bool:
+        return data[1] == Commands.RESET or (data[1] == Commands.PUMP and data[2] == 0x00)
+
+    @property
+    def idle(self) -> bool:
+        return not self._pending and self._inflight is None
+
+    def is_pending(self, command: int) -> bool:
+        # Queued or currently being written
+        return command in self._pending or command == self._inflight
+
+    def submit(self, data: bytes, response: bool = True, delay: float = 0.0) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        key = data[1]
+        entry = self._pending.get(key)
+        if entry is None:
+            if len(self._pending) >= self.maxsize:
+                raise Exception("Command queue full")
+            entry = PendingFrame(data, response, delay)
+            self._pending[key] = entry
+        else:
+            entry.data = data
+            entry.response = response
+            entry.delay = delay
+            self.coalesced += 1
+
+        future = loop.create_future()
+        entry.waiters.append(future)
+        entry.submitted_at.append(time.perf_counter())
+        self.submitted += 1
+
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._run())
+        self._wakeup.set()
+        return future
+
+    def stop(self, error: Optional[Exception] = None):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        pending, self._pending = self._pending, {}
+        for entry in pending.values():
+            for future in entry.waiters:
+                if not future.done():
+                    future.set_exception(error or Exception("Not connected"))
+
+    def _next(self) -> PendingFrame:
+        for key, entry in self._pending.items():
+            if self.is_priority(entry.data):
+                return self._pending.pop(key)
+        return self._pending.pop(next(iter(self._pending)))
+
+    async def _run(self):
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            entry = self._next()
+            self._inflight = entry.data[1]
+            try:
+                await self._write(entry.data, entry.response)
+                if entry.delay > 0:
+                    await asyncio.sleep(entry.delay)
+            except asyncio.CancelledError:
+                self._inflight = None
+                for future in entry.waiters:
+                    future.cancel()
+                raise
+            except Exception as e:
+                self._inflight = None
+                self.failed += 1
+                for future in entry.waiters:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                self._inflight = None
+                self.sent += 1
+                now = time.perf_counter()
+                for submitted_at in entry.submitted_at:
+                    latency = now - submitted_at
+                    self.latency_total += latency
+                    self.latency_max = max(self.latency_max, latency)
+                    self.latency_count += 1
+                for future in entry.waiters:
+                    if not future.done():
+                        future.set_result(None)
+
+    @property
+    def latency_mean(self) -> float:
+        return self.latency_total / self.latency_count if self.latency_count else 0.0
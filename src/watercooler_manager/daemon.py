@@ -0,0 +1,365 @@
+import os
+import json
+import errno
+import signal
+import socket
+import asyncio
+import argparse
+from typing import List, Optional, Tuple
+from .device import WaterCoolingDevice
+from .settings import Settings
+from .cache import DeviceCache
+from .enums import PumpVoltage, RGBState
+from .models import PUMP_VOLTAGE_PRESETS, RGB_COLOR_PRESETS
+from .protocol import (settings_frames, fan_frame, fan_off_frame, pump_frame, pump_off_frame,
+                       rgb_frame, rgb_off_frame)
+from .metrics import serve_metrics
+from .supervisor import ReconnectSupervisor
+from .animation import Animator, gradient, pulse, flash, levels
+from .trace import TraceRecorder
+from .cli import SOCKET_PATH
+
+def parse_voltage(value) -> PumpVoltage:
+    if isinstance(value, int):
+        return PumpVoltage(value)
+    for voltage, label in PUMP_VOLTAGE_PRESETS:
+        if label.lower() == str(value).lower():
+            return voltage
+    name = str(value).upper()
+    if name.endswith("V"):
+        # "12V" for V12, which has no menu preset
+        name = "V" + name[:-1]
+    try:
+        return PumpVoltage[name]
+    except KeyError:
+        raise ValueError(f"Unknown pump voltage: {value}")
+
+def parse_color(value) -> Tuple[int, int, int]:
+    if isinstance(value, str):
+        for color, label in RGB_COLOR_PRESETS:
+            if label.lower() == value.lower():
+                return color
+        value = value.split(",")
+    red, green, blue = (int(x) for x in value)
+    return red, green, blue
+
+def parse_mode(value) -> RGBState:
+    if isinstance(value, int):
+        return RGBState(value)
+    try:
+        return RGBState[str(value).upper()]
+    except KeyError:
+        raise ValueError(f"Unknown RGB mode: {value}")
+
+def cpu_load() -> float:
+    return os.getloadavg()[0] / (os.cpu_count() or 1)
+
+class Daemon:
+    # Owns the cooler connection and serves line-delimited JSON requests on a
+    # Unix socket: {"cmd": "fan", "speed": 50} -> {"ok": true, ...}
+    METRICS_DUMP_INTERVAL = 15.0
+    # How long a command waits for an automatic reconnect before failing
+    RECOVERY_WAIT = 10.0
+
+    def __init__(self, socket_path: str = SOCKET_PATH, address: Optional[str] = None, backend=None,
+                 metrics_port: Optional[int] = None, metrics_file: Optional[str] = None,
+                 trace_file: Optional[str] = None, idle_timeout: Optional[float] = None,
+                 scan_filter: bool = False):
+        self.socket_path = socket_path
+        self.address = address
+        self.metrics_port = metrics_port
+        self.metrics_file = metrics_file
+        self.settings = Settings()
+        self.device = WaterCoolingDevice(backend=backend, idle_timeout=idle_timeout, scan_filter=scan_filter)
+        if trace_file:
+            self.device.trace = TraceRecorder(trace_file)
+        self.device_cache = DeviceCache()
+        self.device_name: Optional[str] = None
+        self.supervisor = ReconnectSupervisor(self.device, self._restore)
+        self.animator = Animator(self.device)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._stopped: Optional[asyncio.Event] = None
+        self._connect_lock = asyncio.Lock()
+
+    def run(self):
+        asyncio.run(self.serve())
+
+    def _claim_socket(self):
+        # A socket file left by a crashed daemon refuses connections and can go;
+        # one that answers belongs to a live daemon, which keeps it
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(self.socket_path)
+            except OSError as e:
+                if e.errno == errno.ENOENT:
+                    return
+                if e.errno != errno.ECONNREFUSED:
+                    raise
+            else:
+                raise SystemExit(f"watercooler daemon already running at {self.socket_path}")
+        os.remove(self.socket_path)
+
+    async def serve(self):
+        self._claim_socket()
+        self._server = await asyncio.start_unix_server(self._handle_client, path=self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+
+        self._stopped = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self._stopped.set)
+            except (RuntimeError, NotImplementedError):
+                # Not the main thread; the owner stops us through stop()
+                pass
+
+        metrics_server = None
+        if self.metrics_port is not None:
+            metrics_server = await serve_metrics(self.device.metrics, port=self.metrics_port)
+        dumping = loop.create_task(self._dump_metrics()) if self.metrics_file else None
+
+        # Connect in the background so status requests are served right away
+        connecting = loop.create_task(self._connect_quietly())
+        try:
+            async with self._server:
+                await self._stopped.wait()
+        finally:
+            connecting.cancel()
+            self.animator.stop()
+            self.supervisor.stop()
+            await self.device.disconnect()
+            self.settings.flush()
+            if self.device.trace is not None:
+                self.device.trace.close()
+            if metrics_server is not None:
+                metrics_server.close()
+            if dumping is not None:
+                dumping.cancel()
+                self._write_metrics()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+    def stop(self):
+        if self._stopped is not None:
+            self._stopped.set()
+
+    async def _dump_metrics(self):
+        while True:
+            self._write_metrics()
+            await asyncio.sleep(self.METRICS_DUMP_INTERVAL)
+
+    def _write_metrics(self):
+        try:
+            self.device.metrics.dump(self.metrics_file)
+        except OSError:
+            pass
+
+    async def _connect_quietly(self):
+        try:
+            await self.ensure_connected()
+        except Exception:
+            pass
+
+    async def ensure_connected(self):
+        if self.supervisor.recovering and not await self.supervisor.wait(self.RECOVERY_WAIT):
+            raise Exception("Connection lost, still reconnecting")
+        async with self._connect_lock:
+            if await self.device.is_connected():
+                return
+
+            candidates = self.device_cache.fresh()
+            if self.address:
+                candidates = [info for info in candidates if info.uuid.lower() == self.address.lower()]
+            target = await self.device.connect_first(candidates)
+            if target is None:
+                target = await self.device.find_device(self.address)
+                if target is None:
+                    raise Exception("CoolingSystem device not found")
+                await self.device.connect(target.uuid)
+
+            self.device_cache.remember(target)
+            self.device_cache.save()
+            self.device_name = target.name
+            await self._restore()
+            self.supervisor.watch(target)
+
+    async def _restore(self):
+        await self.device.write_frames(settings_frames(self.settings))
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    response = await self.handle(json.loads(line))
+                except Exception as e:
+                    response = {"ok": False, "error": str(e)}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def handle(self, request: dict) -> dict:
+        command = request.get("cmd")
+        if command == "status":
+            return self.status()
+        if command == "connect":
+            await self.ensure_connected()
+            return self.status()
+        if command == "disconnect":
+            self.animator.stop()
+            self.supervisor.stop()
+            await self.device.disconnect()
+            return self.status()
+
+        if command == "profile":
+            await self._profile(request)
+            return self.status()
+
+        if command == "animate":
+            await self.ensure_connected()
+            await self._animate(request)
+            return self.status()
+
+        requests = request.get("commands", []) if command == "batch" else [request]
+        # Every frame is built, and so validated, before any setting changes
+        changes: dict = {}
+        frames = [self._frame(item, changes) for item in requests]
+        for name, value in changes.items():
+            setattr(self.settings, name, value)
+        await self.ensure_connected()
+        if any(item.get("cmd") == "rgb" for item in requests):
+            self.animator.stop()
+        # Frames matching what the cooler already has are skipped unless forced
+        await self.device.write_frames(frames, force=request.get("force", False))
+        self.settings.save()
+        return self.status()
+
+    async def _profile(self, request: dict):
+        action = request.get("action", "apply")
+        name = request.get("name", "")
+        if action == "list":
+            return
+        if action == "save":
+            self.settings.save_profile(name)
+        else:
+            # Case-insensitive lookup, so "full load" selects "Full load"
+            name = next((known for known in self.settings.profiles if known.lower() == name.lower()), name)
+            if action == "delete":
+                self.settings.delete_profile(name)
+            elif action == "apply":
+                profile = self.settings.apply_profile(name)
+                await self.ensure_connected()
+                self.animator.stop()
+                await self.device.apply_profile(profile)
+            else:
+                raise ValueError(f"Unknown profile action: {action}")
+        self.settings.save()
+
+    async def _animate(self, request: dict):
+        effect = request.get("effect", "gradient")
+        colors = [parse_color(color) for color in request.get("colors", [])]
+        fps = request.get("fps")
+        settings = self.settings
+        current = rgb_off_frame() if settings.rgb_is_off else rgb_frame(*settings.rgb_color, settings.rgb_state)
+        if effect == "off":
+            self.animator.stop()
+            await self.device.write_buffer(current)
+        elif effect == "gradient":
+            self.animator.play(gradient(colors or [color for color, _ in RGB_COLOR_PRESETS]), fps)
+        elif effect == "pulse":
+            self.animator.play(pulse(colors[0] if colors else settings.rgb_color), fps)
+        elif effect == "flash":
+            self.animator.play(flash(colors[0] if colors else (255, 255, 255)), fps, after=current)
+        elif effect == "load":
+            low, high = (colors[0], colors[-1]) if len(colors) > 1 else ((0, 255, 0), (255, 0, 0))
+            self.animator.follow(levels(low, high), cpu_load, fps)
+        else:
+            raise ValueError(f"Unknown effect: {effect}")
+
+    def _frame(self, request: dict, changes: dict) -> bytes:
+        # Returns the frame for one command and records the settings it changes
+        # in `changes`, on top of those of earlier commands in the same batch.
+        # The stored settings are left alone; the frame builders raise on bad values.
+        command = request.get("cmd")
+        off = request.get("off", False)
+        current = lambda name: changes.get(name, getattr(self.settings, name))
+        if command == "fan":
+            if off:
+                frame = fan_off_frame()
+            else:
+                speed = int(request.get("speed", current("current_fan_speed")))
+                frame = fan_frame(speed)
+                changes["current_fan_speed"] = speed
+            changes["fan_is_off"] = off
+            return frame
+        if command == "pump":
+            if off:
+                frame = pump_off_frame()
+            else:
+                voltage = parse_voltage(request["voltage"]) if "voltage" in request else current("current_voltage")
+                frame = pump_frame(pump_voltage=voltage)
+                changes["current_voltage"] = voltage
+            changes["pump_is_off"] = off
+            return frame
+        if command == "rgb":
+            if off:
+                frame = rgb_off_frame()
+            else:
+                color = parse_color(request["color"]) if "color" in request else current("rgb_color")
+                state = parse_mode(request["mode"]) if "mode" in request else current("rgb_state")
+                frame = rgb_frame(*color, state)
+                changes["rgb_color"] = color
+                changes["rgb_state"] = state
+            changes["rgb_is_off"] = off
+            return frame
+        raise ValueError(f"Unknown command: {command}")
+
+    def status(self) -> dict:
+        settings = self.settings
+        return {
+            "ok": True,
+            "connected": self.device.client is not None and self.device.client.is_connected,
+            "parked": self.device.parked,
+            "device": self.device_name,
+            "model": self.device.connected_model,
+            "adapter": self.device.adapter,
+            "reconnecting": self.supervisor.recovering,
+            "suppressed_writes": self.device.suppressed,
+            "profile": settings.active_profile(),
+            "profiles": list(settings.profiles),
+            "animation": {"running": self.animator.running, "fps": round(self.animator.achieved_fps, 1),
+                          "dropped": self.animator.dropped, "suppressed": self.animator.suppressed},
+            "pump": {"off": settings.pump_is_off, "voltage": PumpVoltage(settings.current_voltage).name},
+            "fan": {"off": settings.fan_is_off, "speed": settings.current_fan_speed},
+            "rgb": {"off": settings.rgb_is_off, "color": list(settings.rgb_color),
+                    "mode": RGBState(settings.rgb_state).name},
+        }
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="watercooler daemon", description="Run the headless watercooler daemon")
+    parser.add_argument("--socket", default=SOCKET_PATH)
+    parser.add_argument("--address", help="Only connect to the cooler with this address")
+    parser.add_argument("--simulate", action="store_true", help="Drive an in-process simulated cooler instead of Bluetooth")
+    parser.add_argument("--metrics-port", type=int, help="Serve Prometheus metrics on 127.0.0.1:PORT")
+    parser.add_argument("--metrics-file", help="Periodically write Prometheus metrics to this file")
+    parser.add_argument("--idle-timeout", type=float,
+                        help="Release the Bluetooth link after this many idle seconds; the next command reconnects")
+    parser.add_argument("--scan-filter", action="store_true",
+                        help="Only scan for adverts carrying the Nordic UART service (crowded BLE environments)")
+    parser.add_argument("--trace", help="Record every frame sent and received to this file (1 MiB, one backup)")
+    args = parser.parse_args(argv)
+    backend = None
+    if args.simulate:
+        from .simulator import SimulatedBackend
+        backend = SimulatedBackend()
+    Daemon(socket_path=args.socket, address=args.address, backend=backend,
+           metrics_port=args.metrics_port, metrics_file=args.metrics_file, trace_file=args.trace,
+           idle_timeout=args.idle_timeout, scan_filter=args.scan_filter).run()
+
+if __name__ == "__main__":
+    main()
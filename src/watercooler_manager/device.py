@@ -1,99 +1,462 @@
-from typing import Optional, List
-from bleak import BleakScanner, BleakClient
-from .models import DeviceInfo, LCTDeviceModel
-from .enums import PumpVoltage, RGBState, Commands, NordicUART
+import asyncio
+import time
+from contextlib import aclosing
+from typing import AsyncIterator, Callable, Dict, Optional, List, Sequence, Tuple
+from .models import DeviceInfo, Profile, model_from_name
+from .enums import Commands, NordicUART, PumpVoltage, RGBState
+from .command_queue import CommandQueue
+from .protocol import (rgb_frame, rgb_off_frame, fan_frame, fan_off_frame,
+                       pump_frame, pump_off_frame, reset_frame, settings_frames)
+from .telemetry import Telemetry
+from .metrics import Metrics
+from .trace import TraceRecorder, RX, ACKNOWLEDGED
+from .transport import BleakBackend
 
 class WaterCoolingDevice:
-    def __init__(self):
-        self.client: Optional[BleakClient] = None
+    # With several adapters, how long to keep listening after a match so the
+    # others can report their signal strength for it
+    ADAPTER_SETTLE = 0.5
+
+    def __init__(self, write_without_response: bool = False, backend=None, idle_timeout: Optional[float] = None,
+                 scan_filter: bool = False):
+        # bleak itself is only imported by the backend on first scan or connect
+        self.backend = backend if backend is not None else BleakBackend()
+        self.client = None
         self.connected_model: Optional[str] = None
+        self.adapter: Optional[str] = None
+        self.commands = CommandQueue(self._write_frame)
+        # Opt-in: skip the link-layer acknowledgement where the TX characteristic allows it
+        self.write_without_response = write_without_response
+        self.supports_write_without_response = False
+        # Opt-in: have the OS only report adverts carrying the Nordic UART service,
+        # for places with many BLE devices around. Coolers whose adverts leave
+        # the service out are not found with it on.
+        self.scan_filter = scan_filter
+        # Devices seen by the last scan and the adapter that heard them best, so
+        # connect() does not have to scan again
+        self._scanned: Dict[str, Tuple[object, Optional[str]]] = {}
+        # Last acknowledged frame per command; a write equal to it is skipped
+        self._shadow: Dict[int, bytes] = {}
+        self.suppressed = 0
+        self.telemetry = Telemetry()
+        # Lazy mode: release the link after idle_timeout seconds without writes; the
+        # device stays logically connected ("parked") and the next write reconnects
+        self.idle_timeout = idle_timeout
+        self._target: Optional[Tuple[str, Optional[str], Optional[str]]] = None
+        self._parked_at: Optional[float] = None
+        self._linked_at: Optional[float] = None
+        self._last_write = 0.0
+        self._idle_handle: Optional[asyncio.TimerHandle] = None
+        self._link_lock = asyncio.Lock()
+        # Called on the event loop when the link drops without disconnect() being called
+        self.on_connection_lost: Optional[Callable[[], None]] = None
+        # Optional frame recorder, see trace.py
+        self.trace: Optional[TraceRecorder] = None
+        # Set to None to switch instrumentation off
+        self.metrics: Optional[Metrics] = Metrics()
 
-    async def connect(self, device_uuid: str):
-        device = await BleakScanner.find_device_by_address(device_uuid)
-        if not device:
-            raise Exception("Device not found")
+    async def connect(self, device_uuid: str, name: Optional[str] = None, adapter: Optional[str] = None):
+        # Passing a known name skips the lookup scan and connects to the address
+        # directly, through `adapter` if given
+        scanned = self._scanned.get(device_uuid)
+        if scanned is None and name is None:
+            info = await self.find_device(device_uuid)
+            if not info:
+                raise Exception("Device not found")
+            device_uuid = info.uuid
+            scanned = self._scanned.get(device_uuid)
+        device = None
+        if scanned is not None:
+            device, adapter = scanned
 
+        metrics = self.metrics
+        start = time.perf_counter()
+        self._shadow.clear()
         try:
-            self.client = BleakClient(device_uuid)
+            link = self.backend.link(device or device_uuid, lambda: self._on_link_lost(link), adapter)
+            self.client = link
             await self.client.connect(timeout=5.0)
-            self.connected_model = await self.device_model_from_name(device.name or "")
+            self.adapter = adapter
+            name = (device.name if device else name) or ""
+            self.connected_model = await self.device_model_from_name(name)
+            self.supports_write_without_response = self.client.supports_write_without_response
+            await self._subscribe_rx()
         except Exception as e:
-            if self.client:
-                await self.client.disconnect()
+            if metrics is not None:
+                metrics.connect_failures += 1
+            # The scanned BLEDevice may be what failed (bleak reuses its BlueZ
+            # object path); the next attempt goes by address and looks it up again
+            self._scanned.pop(device_uuid, None)
+            client, self.client = self.client, None
+            if client:
+                await client.disconnect()
             raise Exception(f"Failed to connect: {str(e)}")
+        if metrics is not None:
+            metrics.connects += 1
+            metrics.connect_seconds.observe(time.perf_counter() - start)
+        self._target = (device_uuid, name, adapter)
+        self._linked_at = time.monotonic()
+        self._touch()
+
+    def _on_link_lost(self, link):
+        # Links we let go of ourselves are detached first, so they end up here
+        # with a different self.client and are ignored
+        if link is not self.client:
+            return
+        if self._target is not None:
+            # Reconnects go by address, not through the BLEDevice of an old scan
+            self._scanned.pop(self._target[0], None)
+        self.client = None
+        self.connected_model = None
+        self.adapter = None
+        self.supports_write_without_response = False
+        self._shadow.clear()
+        self.commands.stop(Exception("Connection lost"))
+        self._link_closed()
+        if self.metrics is not None:
+            self.metrics.disconnects += 1
+        if self.on_connection_lost is not None:
+            self.on_connection_lost()
+
+    async def _subscribe_rx(self):
+        try:
+            await self.client.start_notify(self._on_rx)
+        except Exception:
+            pass
+
+    def _on_rx(self, data: bytearray):
+        if self.trace is not None:
+            self.trace.record(RX, bytes(data))
+        self.telemetry.feed(data)
+
+    async def connect_first(self, candidates: Sequence[DeviceInfo]) -> Optional[DeviceInfo]:
+        for info in candidates:
+            try:
+                await self.connect(info.uuid, name=info.name, adapter=info.adapter)
+                return info
+            except Exception:
+                continue
+        return None
 
     async def disconnect(self):
+        if self._parked_at is not None:
+            # Released for idleness: there is no link to send a reset over
+            self._unpark()
+            self._target = None
+            self.connected_model = None
+            return
         if self.client and self.client.is_connected:
             try:
                 await self.write_reset()
             except:
                 pass
-            await self.client.disconnect()
-            self.client = None
+            self.commands.stop()
+            self._shadow.clear()
+            client, self.client = self.client, None
+            await client.disconnect()
+            self._link_closed()
+            if self.metrics is not None:
+                self.metrics.disconnects += 1
+            self._target = None
             self.connected_model = None
+            self.adapter = None
+            self.supports_write_without_response = False
 
     async def device_model_from_name(self, name: str) -> Optional[str]:
-        for model in [LCTDeviceModel.LCT21001, LCTDeviceModel.LCT22002]:
-            if model.lower() in name.lower():
-                return model
-        return None
+        return model_from_name(name)
 
-    async def get_device_list(self) -> List[DeviceInfo]:
-        devices = await BleakScanner.discover(return_adv=True)
-        device_info_list = []
+    async def discover(self, timeout: float = 5.0, limit: Optional[int] = None,
+                       address: Optional[str] = None, quiet: Optional[float] = None) -> AsyncIterator[DeviceInfo]:
+        # Yields coolers as their adverts arrive, scanning on every adapter at
+        # once. Stops after `limit` matches, once `address` is seen, after `quiet`
+        # seconds without a new match, or at `timeout`. A yielded DeviceInfo keeps
+        # being updated with the strongest adapter until the scan ends.
+        loop = asyncio.get_running_loop()
+        adverts: asyncio.Queue = asyncio.Queue()
+        found: Dict[str, DeviceInfo] = {}
+        settling = False
+        target = address.lower() if address is not None else None
 
-        for addr, (device, adv) in devices.items():            
-            if not device.name:
-                continue
+        def on_advert(device, adv, adapter):
+            # Runs for every advert in range, so anything that cannot be a
+            # cooler is dropped here before it costs a queue entry
+            if device.address in found:
+                adverts.put_nowait((adapter, device, adv, None))
+            elif not settling:
+                model = model_from_name(device.name or "")
+                if model is not None or device.address.lower() == target:
+                    adverts.put_nowait((adapter, device, adv, model))
+
+        def callback(adapter):
+            # bleak only accepts callbacks with exactly (device, advertisement)
+            return lambda device, adv: on_advert(device, adv, adapter)
+
+        service_uuids = [NordicUART.SERVICE_UUID] if self.scan_filter else None
+        scanners = [self.backend.scanner(callback(adapter), adapter, service_uuids)
+                    for adapter in self.backend.adapters()]
+        start = last_match = loop.time()
+        deadline = start + timeout
+        if self.metrics is not None:
+            self.metrics.scans += 1
+
+        scanning = []
+        try:
+            # A powered-off or rfkill'd adapter drops out instead of failing the scan
+            results = await asyncio.gather(*(scanner.start() for scanner in scanners), return_exceptions=True)
+            scanning = [scanner for scanner, result in zip(scanners, results) if not isinstance(result, BaseException)]
+            if not scanning:
+                raise results[0]
+            while True:
+                now = loop.time()
+                wait = deadline - now
+                if quiet is not None and found and not settling:
+                    wait = min(wait, last_match + quiet - now)
+                if wait <= 0:
+                    return
+                try:
+                    adapter, device, adv, model = await asyncio.wait_for(adverts.get(), wait)
+                except asyncio.TimeoutError:
+                    return
+
+                rssi = adv.rssi or 0
+                info = found.get(device.address)
+                if info is not None:
+                    if rssi > info.rssi:
+                        info.rssi = rssi
+                        info.adapter = adapter
+                        self._scanned[device.address] = (device, adapter)
+                    continue
+                if settling:
+                    continue
+                is_target = device.address.lower() == target
 
-            model = await self.device_model_from_name(device.name)
-            if model:                
+                last_match = loop.time()
                 info = DeviceInfo()
                 info.uuid = device.address
-                info.name = device.name
-                info.rssi = adv.rssi or 0
-                device_info_list.append(info)
+                info.name = device.name or ""
+                info.rssi = rssi
+                info.model = model
+                info.adapter = adapter
+                found[device.address] = info
+                self._scanned[device.address] = (device, adapter)
+                if self.metrics is not None:
+                    self.metrics.devices_found += 1
+                yield info
+
+                if is_target or (limit is not None and len(found) >= limit):
+                    if len(scanning) == 1:
+                        return
+                    settling = True
+                    deadline = min(deadline, loop.time() + self.ADAPTER_SETTLE)
+        finally:
+            await asyncio.gather(*(scanner.stop() for scanner in scanning), return_exceptions=True)
+            if self.metrics is not None:
+                self.metrics.scan_seconds.observe(loop.time() - start)
 
-        return device_info_list
+    async def find_device(self, address: Optional[str] = None, timeout: float = 5.0) -> Optional[DeviceInfo]:
+        # Runs the scan to its end, so the match carries the strongest adapter
+        match = None
+        async with aclosing(self.discover(timeout=timeout, limit=1 if address is None else None, address=address)) as found:
+            async for info in found:
+                if match is None and (address is None or info.uuid.lower() == address.lower()):
+                    match = info
+        return match
+
+    async def get_device_list(self, timeout: float = 5.0) -> List[DeviceInfo]:
+        # Strongest signal first
+        devices = [info async for info in self.discover(timeout=timeout)]
+        return sorted(devices, key=lambda info: info.rssi, reverse=True)
 
     async def is_connected(self) -> bool:
+        # A parked device counts as connected; its link comes back on the next write
+        return self._parked_at is not None or self._linked()
+
+    def _linked(self) -> bool:
         return self.client is not None and self.client.is_connected
 
-    async def write_buffer(self, data: bytearray):
+    @property
+    def parked(self) -> bool:
+        return self._parked_at is not None
+
+    def _touch(self):
+        # Called after every write; one timer per idle period rather than per write
+        if self.idle_timeout is None:
+            return
+        loop = asyncio.get_running_loop()
+        self._last_write = loop.time()
+        if self._idle_handle is None:
+            self._idle_handle = loop.call_later(self.idle_timeout, self._check_idle)
+
+    def _check_idle(self):
+        self._idle_handle = None
+        if not self._linked() or self.idle_timeout is None:
+            return
+        loop = asyncio.get_running_loop()
+        remaining = self._last_write + self.idle_timeout - loop.time()
+        if remaining > 0 or not self.commands.idle:
+            self._idle_handle = loop.call_later(max(remaining, self.idle_timeout / 10), self._check_idle)
+            return
+        loop.create_task(self.release())
+
+    async def release(self):
+        # Gives the radio back without resetting the cooler, which keeps running
+        # with its current settings
+        async with self._link_lock:
+            if not self._linked() or self._target is None or not self.commands.idle:
+                return
+            client, self.client = self.client, None
+            self._shadow.clear()
+            self._scanned.pop(self._target[0], None)
+            self._parked_at = time.monotonic()
+            self._link_closed()
+            if self.metrics is not None:
+                self.metrics.idle_releases += 1
+            try:
+                await client.disconnect()
+            except Exception:
+                pass
+
+    async def _wake(self):
+        async with self._link_lock:
+            if self._parked_at is None or self._linked():
+                return
+            address, name, adapter = self._target
+            start = time.perf_counter()
+            try:
+                await self.connect(address, name=name, adapter=adapter)
+            except Exception:
+                # Switched off or out of range while parked: stop reporting a
+                # connection and hand over to whoever handles lost links
+                self._unpark()
+                self._target = None
+                self.connected_model = None
+                self.adapter = None
+                self.supports_write_without_response = False
+                if self.metrics is not None:
+                    self.metrics.disconnects += 1
+                if self.on_connection_lost is not None:
+                    self.on_connection_lost()
+                raise
+            self._unpark()
+            if self.metrics is not None:
+                self.metrics.wake_seconds.observe(time.perf_counter() - start)
+
+    def _unpark(self):
+        if self._parked_at is not None:
+            if self.metrics is not None:
+                self.metrics.parked_seconds += time.monotonic() - self._parked_at
+            self._parked_at = None
+
+    def _link_closed(self):
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+        if self._linked_at is not None:
+            if self.metrics is not None:
+                self.metrics.link_seconds += time.monotonic() - self._linked_at
+            self._linked_at = None
+
+    def invalidate(self):
+        # Forget what the cooler is believed to be doing, so the next writes go out
+        self._shadow.clear()
+
+    def _is_redundant(self, data) -> bool:
+        command = data[1]
+        if command == Commands.RESET or self.commands.is_pending(command):
+            return False
+        if self._shadow.get(command) != data:
+            return False
+        self.suppressed += 1
+        if self.metrics is not None:
+            self.metrics.observe_suppressed(command)
+        return True
+
+    async def write_buffer(self, data: bytearray, response: Optional[bool] = None, force: bool = False):
+        if not await self.is_connected():
+            raise Exception("Not connected")
+        if not force and self._is_redundant(data):
+            return
+        if self._parked_at is not None:
+            await self._wake()
+        if response is None:
+            response = not self.write_without_response
+        await self.commands.submit(bytes(data), response)
+
+    async def write_frames(self, frames: Sequence[bytes], pacing: float = 0.0, confirm: bool = True,
+                           force: bool = False):
+        # Frames are queued back-to-back; in write-without-response mode only the
+        # last one (if confirm is set) waits for the acknowledgement
         if not await self.is_connected():
             raise Exception("Not connected")
-        await self.client.write_gatt_char(NordicUART.CHAR_TX, data)
+        if not force:
+            # Only the last frame per command decides where the cooler ends up
+            # (the queue collapses the others anyway), so that is the one to
+            # compare with the shadow; an earlier one must not slip through alone
+            final = {data[1]: i for i, data in enumerate(frames)}
+            frames = [data for i, data in enumerate(frames) if final[data[1]] == i and not self._is_redundant(data)]
+        if frames and self._parked_at is not None:
+            await self._wake()
+        futures = []
+        last = len(frames) - 1
+        for i, data in enumerate(frames):
+            response = not self.write_without_response or (confirm and i == last)
+            futures.append(self.commands.submit(bytes(data), response, pacing))
+        await asyncio.gather(*futures)
+
+    async def apply_profile(self, profile: Profile, started: Optional[float] = None) -> float:
+        # One ordered batch, last frame acknowledged. `started` is the
+        # perf_counter() of the user's selection, if that happened elsewhere
+        if started is None:
+            started = time.perf_counter()
+        await self.write_frames(settings_frames(profile))
+        elapsed = time.perf_counter() - started
+        if self.metrics is not None:
+            self.metrics.profile_switch_seconds.observe(elapsed)
+        return elapsed
+
+    async def _write_frame(self, data: bytes, response: bool = True):
+        if not self._linked():
+            raise Exception("Not connected")
+        if not self.supports_write_without_response:
+            response = True
+        command = data[1]
+        metrics = self.metrics
+        start = time.perf_counter()
+        try:
+            await self.client.write(data, response)
+        except Exception:
+            # The frame may or may not have reached the cooler
+            self._shadow.pop(command, None)
+            if metrics is not None:
+                metrics.observe_write(command, 0.0, ok=False)
+            raise
+        if command == Commands.RESET:
+            self._shadow.clear()
+        else:
+            self._shadow[command] = bytes(data)
+        if self.trace is not None:
+            self.trace.record(ACKNOWLEDGED if response else 0, data)
+        if metrics is not None:
+            metrics.observe_write(command, time.perf_counter() - start)
+        self._touch()
 
     async def write_rgb(self, red: int, green: int, blue: int, state: RGBState):
-        if not all(0 <= x <= 0xff for x in (red, green, blue)) or not 0 <= state <= 0x03:
-            raise ValueError("Parameters out of range")
-        data = bytearray([0xfe, Commands.RGB, 0x01, red, green, blue, state, 0xef])
-        await self.write_buffer(data)
+        await self.write_buffer(rgb_frame(red, green, blue, state))
 
     async def write_rgb_off(self):
-        data = bytearray([0xfe, Commands.RGB, 0x00, 0x00, 0x00, 0x00, 0x00, 0xef])
-        await self.write_buffer(data)
+        await self.write_buffer(rgb_off_frame())
 
     async def write_fan_mode(self, duty_cycle_percent: int):
-        if not 0 <= duty_cycle_percent <= 0xff:
-            raise ValueError("Duty cycle out of range")
-        data = bytearray([0xfe, Commands.FAN, 0x01, duty_cycle_percent, 0x00, 0x00, 0x00, 0xef])
-        await self.write_buffer(data)
+        await self.write_buffer(fan_frame(duty_cycle_percent))
 
     async def write_fan_off(self):
-        data = bytearray([0xfe, Commands.FAN, 0x00, 0x00, 0x00, 0x00, 0x00, 0xef])
-        await self.write_buffer(data)
+        await self.write_buffer(fan_off_frame())
 
     async def write_pump_mode(self, pump_duty_cycle_percent: int = 60, pump_voltage: PumpVoltage = PumpVoltage.V7):
-        if not 0 <= pump_duty_cycle_percent <= 100 or not 0 <= pump_voltage <= 0x03:
-            raise ValueError("Parameters out of range")
-        data = bytearray([0xfe, Commands.PUMP, 0x01, pump_duty_cycle_percent, pump_voltage, 0x00, 0x00, 0xef])
-        await self.write_buffer(data)
+        await self.write_buffer(pump_frame(pump_duty_cycle_percent, pump_voltage))
 
     async def write_pump_off(self):
-        data = bytearray([0xfe, Commands.PUMP, 0x00, 0x00, 0x00, 0x00, 0x00, 0xef])
-        await self.write_buffer(data)
+        await self.write_buffer(pump_off_frame())
 
     async def write_reset(self):
-        data = bytearray([0xfe, Commands.RESET, 0x00, 0x01, 0x00, 0x00, 0x00, 0xef])
-        await self.write_buffer(data) 
\ No newline at end of file
+        await self.write_buffer(reset_frame())
@@ -0,0 +1,74 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Union
+from .device import WaterCoolingDevice
+from .models import DeviceInfo, FleetResult
+
+class DeviceFleet:
+    def __init__(self, write_without_response: bool = False, backend=None):
+        self.devices: Dict[str, WaterCoolingDevice] = {}
+        self.write_without_response = write_without_response
+        self.backend = backend
+        # What the last discover() reported, so connect() can skip the lookup scans
+        self.discovered: Dict[str, DeviceInfo] = {}
+
+    async def discover(self) -> List[DeviceInfo]:
+        devices = await WaterCoolingDevice(backend=self.backend).get_device_list()
+        self.discovered.update((info.uuid, info) for info in devices)
+        return devices
+
+    async def connect(self, targets: Iterable[Union[str, DeviceInfo]]) -> Dict[str, FleetResult]:
+        # Coolers given as a DeviceInfo, or found by discover(), are connected to
+        # directly; a bare unknown address costs each device its own scan
+        async def connect_one(target: Union[str, DeviceInfo]):
+            info = target if isinstance(target, DeviceInfo) else self.discovered.get(target)
+            address = info.uuid if info is not None else target
+            device = self.devices.get(address)
+            if device is None:
+                device = WaterCoolingDevice(write_without_response=self.write_without_response, backend=self.backend)
+                self.devices[address] = device
+            if not await device.is_connected():
+                if info is not None:
+                    await device.connect(address, name=info.name, adapter=info.adapter)
+                else:
+                    await device.connect(address)
+
+        return await self._gather({target.uuid if isinstance(target, DeviceInfo) else target: connect_one(target)
+                                   for target in targets})
+
+    async def disconnect(self, addresses: Optional[Iterable[str]] = None) -> Dict[str, FleetResult]:
+        results = await self.run(lambda device: device.disconnect(), addresses)
+        for address in results:
+            self.devices.pop(address, None)
+        return results
+
+    async def run(self, command: Callable[[WaterCoolingDevice], Awaitable],
+                  addresses: Optional[Iterable[str]] = None) -> Dict[str, FleetResult]:
+        if addresses is None:
+            addresses = list(self.devices)
+        coros = {}
+        for address in addresses:
+            device = self.devices.get(address)
+            coros[address] = command(device) if device else self._unknown(address)
+        return await self._gather(coros)
+
+    async def connected(self) -> List[str]:
+        return [address for address, device in self.devices.items() if await device.is_connected()]
+
+    async def _unknown(self, address: str):
+        raise Exception(f"Unknown device {address}")
+
+    async def _gather(self, coros: Dict[str, Awaitable]) -> Dict[str, FleetResult]:
+        async def timed(address: str, coro: Awaitable) -> FleetResult:
+            result = FleetResult(address)
+            start = time.perf_counter()
+            try:
+                result.value = await coro
+                result.ok = True
+            except Exception as e:
+                result.error = e
+            result.elapsed = time.perf_counter() - start
+            return result
+
+        results = await asyncio.gather(*(timed(address, coro) for address, coro in coros.items()))
+        return {result.address: result for result in results}
@@ -0,0 +1,155 @@
+import asyncio
+import os
+import tempfile
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+from .enums import Commands
+
+# Label values for the per-command series, keyed by the frame's command byte
+COMMAND_NAMES = {value: name.lower() for name, value in vars(Commands).items() if name.isupper()}
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SCAN_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0)
+
+class Histogram:
+    # Fixed upper bounds chosen up front, so observe() is a bisect and two
+    # additions: no allocation, safe to leave on for every write
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        result = []
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            result.append((_format(bound), total))
+        result.append(("+Inf", self.count))
+        return result
+
+class Metrics:
+    def __init__(self):
+        self.scan_seconds = Histogram(SCAN_BUCKETS)
+        self.connect_seconds = Histogram(SCAN_BUCKETS)
+        self.recovery_seconds = Histogram(SCAN_BUCKETS)
+        self.profile_switch_seconds = Histogram()
+        self.wake_seconds = Histogram(SCAN_BUCKETS)
+        self.write_seconds: Dict[str, Histogram] = {name: Histogram() for name in COMMAND_NAMES.values()}
+        self.scans = 0
+        self.devices_found = 0
+        self.connects = 0
+        self.connect_failures = 0
+        self.disconnects = 0
+        self.reconnects = 0
+        self.idle_releases = 0
+        self.link_seconds = 0.0
+        self.parked_seconds = 0.0
+        self.writes: Dict[str, int] = dict.fromkeys(COMMAND_NAMES.values(), 0)
+        self.write_failures: Dict[str, int] = dict.fromkeys(COMMAND_NAMES.values(), 0)
+        self.writes_suppressed: Dict[str, int] = dict.fromkeys(COMMAND_NAMES.values(), 0)
+
+    def observe_write(self, command: int, seconds: float, ok: bool = True):
+        name = COMMAND_NAMES.get(command)
+        if name is None:
+            return
+        if ok:
+            self.writes[name] += 1
+            self.write_seconds[name].observe(seconds)
+        else:
+            self.write_failures[name] += 1
+
+    def observe_suppressed(self, command: int):
+        name = COMMAND_NAMES.get(command)
+        if name is not None:
+            self.writes_suppressed[name] += 1
+
+    def render(self) -> str:
+        # Prometheus text exposition format, version 0.0.4
+        lines: List[str] = []
+        _histogram(lines, "watercooler_scan_seconds", "Duration of BLE scans", {"": self.scan_seconds})
+        _histogram(lines, "watercooler_connect_seconds", "Duration of successful connects", {"": self.connect_seconds})
+        _histogram(lines, "watercooler_recovery_seconds", "Time from a dropped link to restored state",
+                   {"": self.recovery_seconds})
+        _histogram(lines, "watercooler_profile_switch_seconds", "From profile selection to the last frame acknowledged",
+                   {"": self.profile_switch_seconds})
+        _histogram(lines, "watercooler_wake_seconds", "Reconnect delay added to the first write after an idle release",
+                   {"": self.wake_seconds})
+        _histogram(lines, "watercooler_write_seconds", "GATT write latency per command",
+                   {f'command="{name}"': hist for name, hist in self.write_seconds.items()})
+        _counter(lines, "watercooler_scans_total", "Scans started", {"": self.scans})
+        _counter(lines, "watercooler_devices_found_total", "Coolers reported by scans", {"": self.devices_found})
+        _counter(lines, "watercooler_connects_total", "Successful connects", {"": self.connects})
+        _counter(lines, "watercooler_connect_failures_total", "Failed connect attempts", {"": self.connect_failures})
+        _counter(lines, "watercooler_disconnects_total", "Disconnects, requested or not", {"": self.disconnects})
+        _counter(lines, "watercooler_reconnects_total", "Automatic recoveries after a dropped link", {"": self.reconnects})
+        _counter(lines, "watercooler_idle_releases_total", "Links released after the idle timeout", {"": self.idle_releases})
+        _counter(lines, "watercooler_link_seconds_total", "Time the BLE link was held open", {"": self.link_seconds})
+        _counter(lines, "watercooler_parked_seconds_total", "Time released for idleness while still logically connected",
+                 {"": self.parked_seconds})
+        _counter(lines, "watercooler_writes_total", "Successful writes per command",
+                 {f'command="{name}"': count for name, count in self.writes.items()})
+        _counter(lines, "watercooler_write_failures_total", "Failed writes per command",
+                 {f'command="{name}"': count for name, count in self.write_failures.items()})
+        _counter(lines, "watercooler_writes_suppressed_total", "Writes skipped because the cooler was already in that state",
+                 {f'command="{name}"': count for name, count in self.writes_suppressed.items()})
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str):
+        # Atomic, so a textfile collector never reads a half-written snapshot
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".metrics-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(self.render())
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+async def serve_metrics(metrics: Metrics, host: str = "127.0.0.1", port: int = 9464) -> asyncio.AbstractServer:
+    # Minimal HTTP endpoint for scrapers: every request gets the current snapshot
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while (await reader.readline()).strip():
+                pass
+            body = metrics.render().encode()
+            writer.write(b"HTTP/1.1 200 OK\r\n"
+                         b"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                         b"Content-Length: " + str(len(body)).encode() + b"\r\n"
+                         b"Connection: close\r\n\r\n" + body)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+def _format(value: float) -> str:
+    return repr(float(value))
+
+def _histogram(lines: List[str], name: str, help: str, series: Dict[str, Histogram]):
+    lines.append(f"# HELP {name} {help}")
+    lines.append(f"# TYPE {name} histogram")
+    for labels, hist in series.items():
+        prefix = labels + "," if labels else ""
+        for bound, count in hist.cumulative():
+            lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {count}')
+        suffix = "{" + labels + "}" if labels else ""
+        lines.append(f"{name}_sum{suffix} {_format(hist.sum)}")
+        lines.append(f"{name}_count{suffix} {hist.count}")
+
+def _counter(lines: List[str], name: str, help: str, series: Dict[str, int]):
+    lines.append(f"# HELP {name} {help}")
+    lines.append(f"# TYPE {name} counter")
+    for labels, value in series.items():
+        suffix = "{" + labels + "}" if labels else ""
+        lines.append(f"{name}{suffix} {value}")
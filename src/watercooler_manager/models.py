@@ -1,9 +1,111 @@
+import re
+from typing import Optional, Tuple
+from .enums import PumpVoltage, RGBState
+
 class LCTDeviceModel:
     LCT21001 = 'LCT21001'
     LCT22002 = 'LCT22002'
 
+# Every model name as one case-insensitive alternation, compiled once; matching
+# an advertised name is a single search() instead of lower-casing it per model
+_MODELS = {value.upper(): value for name, value in vars(LCTDeviceModel).items() if name.isupper()}
+_MODEL_PATTERN = re.compile("|".join(re.escape(model) for model in _MODELS), re.IGNORECASE)
+
+def model_from_name(name: str) -> Optional[str]:
+    match = _MODEL_PATTERN.search(name)
+    return _MODELS[match.group().upper()] if match else None
+
+# Menu presets, in display order
+PUMP_VOLTAGE_PRESETS = (
+    (PumpVoltage.V7, '7V'),
+    (PumpVoltage.V8, '8V'),
+    (PumpVoltage.V11, '11V'),
+)
+
+FAN_SPEED_PRESETS = (25, 50, 75, 90)
+
+RGB_MODE_PRESETS = (
+    (RGBState.STATIC, 'Static'),
+    (RGBState.BREATHE, 'Breathe'),
+    (RGBState.COLORFUL, 'Rainbow'),
+    (RGBState.BREATHE_COLOR, 'Breathe Rainbow'),
+)
+
+RGB_COLOR_PRESETS = (
+    ((255, 0, 0), 'Red'),
+    ((0, 255, 0), 'Green'),
+    ((0, 0, 255), 'Blue'),
+    ((255, 255, 255), 'White'),
+)
+
+# Cooler state fields shared by Profile and Settings, so either can be passed to
+# protocol.settings_frames()
+PROFILE_FIELDS = ('pump_is_off', 'current_voltage', 'fan_is_off', 'current_fan_speed',
+                  'rgb_is_off', 'rgb_color', 'rgb_state')
+
+class Profile:
+    def __init__(self, name: str, current_voltage: PumpVoltage = PumpVoltage.V7, current_fan_speed: int = 50,
+                 rgb_color: Tuple[int, int, int] = (255, 0, 0), rgb_state: RGBState = RGBState.STATIC,
+                 pump_is_off: bool = False, fan_is_off: bool = False, rgb_is_off: bool = False):
+        self.name = name
+        self.current_voltage = current_voltage
+        self.current_fan_speed = current_fan_speed
+        self.rgb_color = rgb_color
+        self.rgb_state = rgb_state
+        self.pump_is_off = pump_is_off
+        self.fan_is_off = fan_is_off
+        self.rgb_is_off = rgb_is_off
+
+    @classmethod
+    def capture(cls, name: str, source) -> "Profile":
+        return cls(name, **{field: getattr(source, field) for field in PROFILE_FIELDS})
+
+    def matches(self, other) -> bool:
+        return all(getattr(self, field) == getattr(other, field) for field in PROFILE_FIELDS)
+
+    def to_dict(self) -> dict:
+        return {
+            'current_voltage': int(self.current_voltage),
+            'current_fan_speed': self.current_fan_speed,
+            'pump_is_off': self.pump_is_off,
+            'fan_is_off': self.fan_is_off,
+            'rgb_state': int(self.rgb_state),
+            'rgb_is_off': self.rgb_is_off,
+            'rgb_color': list(self.rgb_color),
+        }
+
+    @classmethod
+    def from_dict(cls, name: str, config: dict) -> "Profile":
+        return cls(name,
+                   current_voltage=PumpVoltage(config['current_voltage']),
+                   current_fan_speed=config['current_fan_speed'],
+                   rgb_color=tuple(config['rgb_color']),
+                   rgb_state=RGBState(config['rgb_state']),
+                   pump_is_off=config['pump_is_off'],
+                   fan_is_off=config['fan_is_off'],
+                   rgb_is_off=config['rgb_is_off'])
+
+# Shipped profiles, in display order; users can overwrite or add their own
+DEFAULT_PROFILES = (
+    Profile('Quiet', current_voltage=PumpVoltage.V7, current_fan_speed=25, rgb_is_off=True),
+    Profile('Balanced', current_voltage=PumpVoltage.V8, current_fan_speed=50),
+    Profile('Full load', current_voltage=PumpVoltage.V11, current_fan_speed=90),
+)
+
 class DeviceInfo:
     def __init__(self):
         self.uuid: str = ""
         self.name: str = ""
-        self.rssi: int = 0 
\ No newline at end of file
+        self.rssi: int = 0
+        self.model: Optional[str] = None
+        self.last_seen: float = 0.0
+        # Adapter that heard the device best, None for the default one
+        self.adapter: Optional[str] = None
+
+class FleetResult:
+    def __init__(self, address: str):
+        self.address: str = address
+        self.ok: bool = False
+        self.error: Optional[Exception] = None
+        self.value = None
+        self.elapsed: float = 0.0
@@ -0,0 +1,109 @@
+from typing import List, Tuple
+from .enums import Commands, PumpVoltage, RGBState
+
+# Every frame is 8 bytes: 0xfe, command, 5 payload bytes, 0xef
+FRAME_START = 0xfe
+FRAME_END = 0xef
+FRAME_SIZE = 8
+
+PUMP_DEFAULT_DUTY = 60
+
+def _frame(command: int, *payload: int) -> bytes:
+    return bytes((FRAME_START, command, *payload, *(0,) * (5 - len(payload)), FRAME_END))
+
+# Fixed frames are built once at import and shared as immutable bytes
+RESET = _frame(Commands.RESET, 0x00, 0x01)
+FAN_OFF = _frame(Commands.FAN)
+PUMP_OFF = _frame(Commands.PUMP)
+RGB_OFF = _frame(Commands.RGB)
+FAN_FRAMES = tuple(_frame(Commands.FAN, 0x01, duty) for duty in range(0x100))
+PUMP_FRAMES = {voltage: _frame(Commands.PUMP, 0x01, PUMP_DEFAULT_DUTY, voltage) for voltage in PumpVoltage}
+
+def fan_frame(duty_cycle_percent: int) -> bytes:
+    if not 0 <= duty_cycle_percent <= 0xff:
+        raise ValueError("Duty cycle out of range")
+    return FAN_FRAMES[duty_cycle_percent]
+
+def fan_off_frame() -> bytes:
+    return FAN_OFF
+
+def pump_frame(pump_duty_cycle_percent: int = PUMP_DEFAULT_DUTY, pump_voltage: PumpVoltage = PumpVoltage.V7) -> bytes:
+    if not 0 <= pump_duty_cycle_percent <= 100 or not 0 <= pump_voltage <= 0x03:
+        raise ValueError("Parameters out of range")
+    if pump_duty_cycle_percent == PUMP_DEFAULT_DUTY:
+        return PUMP_FRAMES[pump_voltage]
+    return _frame(Commands.PUMP, 0x01, pump_duty_cycle_percent, pump_voltage)
+
+def pump_off_frame() -> bytes:
+    return PUMP_OFF
+
+def rgb_frame(red: int, green: int, blue: int, state: RGBState) -> bytes:
+    if (red | green | blue) >> 8 or state >> 2:
+        raise ValueError("Parameters out of range")
+    return bytes((FRAME_START, Commands.RGB, 0x01, red, green, blue, state, FRAME_END))
+
+def rgb_off_frame() -> bytes:
+    return RGB_OFF
+
+def reset_frame() -> bytes:
+    return RESET
+
+def settings_frames(settings) -> List[bytes]:
+    # Frames that bring a cooler to the state stored in Settings, including
+    # switching off whatever the user turned off
+    return [
+        PUMP_OFF if settings.pump_is_off else pump_frame(pump_voltage=settings.current_voltage),
+        FAN_OFF if settings.fan_is_off else fan_frame(settings.current_fan_speed),
+        RGB_OFF if settings.rgb_is_off else rgb_frame(*settings.rgb_color, settings.rgb_state),
+    ]
+
+class Encoder:
+    # Packs variable frames into one reusable buffer. The returned view is only
+    # valid until the next pack call; copy it with bytes() if it has to be kept.
+    def __init__(self):
+        self._rgb = bytearray(RGB_OFF)
+        self._rgb[2] = 0x01
+        self._rgb_view = memoryview(self._rgb)
+
+    def pack_rgb(self, red: int, green: int, blue: int, state: RGBState) -> memoryview:
+        if (red | green | blue) >> 8 or state >> 2:
+            raise ValueError("Parameters out of range")
+        buffer = self._rgb
+        buffer[3] = red
+        buffer[4] = green
+        buffer[5] = blue
+        buffer[6] = state
+        return self._rgb_view
+
+def decode(frame: bytes) -> Tuple[int, bytes]:
+    if len(frame) != FRAME_SIZE or frame[0] != FRAME_START or frame[-1] != FRAME_END:
+        raise ValueError("Invalid frame")
+    return frame[1], bytes(frame[2:7])
+
+class FrameDecoder:
+    # Reassembles frames from a byte stream; notifications may split or concatenate them
+    def __init__(self):
+        self.errors = 0
+        self._pending = bytearray()
+
+    def feed(self, data: bytes) -> List[bytes]:
+        frames = []
+        pending = self._pending
+        pending += data
+        while len(pending) >= FRAME_SIZE:
+            start = pending.find(FRAME_START)
+            if start < 0:
+                self.errors += 1
+                pending.clear()
+                break
+            if start > 0:
+                self.errors += 1
+                del pending[:start]
+                continue
+            if pending[FRAME_SIZE - 1] != FRAME_END:
+                self.errors += 1
+                del pending[:1]
+                continue
+            frames.append(bytes(pending[:FRAME_SIZE]))
+            del pending[:FRAME_SIZE]
+        return frames
@@ -1,17 +1,37 @@
 import os
 import json
 import platform
-from typing import Tuple
+import tempfile
+import threading
+from typing import Callable, Dict, Optional, Tuple
 from .enums import PumpVoltage, RGBState
-import winshell
+from .models import DEFAULT_PROFILES, PROFILE_FIELDS, Profile
 from os.path import join, basename, splitext
 from sys import executable
 
+def write_file_atomic(path: str, text: str):
+    # Write to a temporary file and rename it over the old one, so a crash
+    # mid-write never leaves a truncated file behind
+    directory = os.path.dirname(path) or '.'
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.watercooler', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
 class Settings:
     REGISTRY_KEY = r"Software\WaterCooler"
     CONFIG_FILE = os.path.expanduser("~/.watercooler.json")
 
-    def __init__(self):
+    def __init__(self, flush_delay: float = 0.5):
         self.current_voltage = PumpVoltage.V7
         self.current_fan_speed = 50
         self.pump_is_off = False
@@ -21,6 +41,17 @@ class Settings:
         self.rgb_color = (255, 0, 0)  # Default red
         self.auto_start = False
         self.auto_connect = False
+        self.auto_thermal = False
+        self.profiles: Dict[str, Profile] = {profile.name: profile for profile in DEFAULT_PROFILES}
+        # Writes are deferred and coalesced; see save() and flush()
+        self.flush_delay = flush_delay
+        self.on_error: Optional[Callable[[Exception], None]] = None
+        self._dirty = False
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        # Bumped for every snapshot taken, so an older one is never written over a newer one
+        self._snapshot = 0
         self.load()
 
     def load(self):
@@ -29,11 +60,90 @@ class Settings:
         else:
             self._load_from_file()
 
+    def apply_profile(self, name: str) -> Profile:
+        # Copies the profile into the current state; the caller saves once
+        profile = self.profiles.get(name)
+        if profile is None:
+            raise ValueError(f"Unknown profile: {name}")
+        for field in PROFILE_FIELDS:
+            setattr(self, field, getattr(profile, field))
+        return profile
+
+    def save_profile(self, name: str) -> Profile:
+        name = name.strip()
+        if not name:
+            raise ValueError("Profile name is empty")
+        profile = Profile.capture(name, self)
+        self.profiles[name] = profile
+        return profile
+
+    def delete_profile(self, name: str):
+        if self.profiles.pop(name, None) is None:
+            raise ValueError(f"Unknown profile: {name}")
+
+    def active_profile(self) -> Optional[str]:
+        for name, profile in self.profiles.items():
+            if profile.matches(self):
+                return name
+        return None
+
     def save(self):
-        if platform.system() == 'Windows':
-            self._save_to_registry()
-        else:
-            self._save_to_file()
+        # Only marks the settings dirty; a background timer writes them at most
+        # once per flush_delay, so menu clicks never wait on disk or registry I/O
+        with self._lock:
+            self._dirty = True
+            if self._timer is None:
+                self._timer = threading.Timer(self.flush_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            dirty = self._dirty
+            if dirty:
+                self._dirty = False
+                self._snapshot += 1
+                snapshot = self._snapshot
+                config = self._to_dict()
+
+        if not dirty:
+            # Nothing new, but the timer may be in the middle of writing; an
+            # explicit flush only returns once that write has finished
+            with self._write_lock:
+                return
+
+        with self._write_lock:
+            if snapshot != self._snapshot:
+                # A newer snapshot was taken meanwhile; its flush writes it
+                return
+            try:
+                if platform.system() == 'Windows':
+                    self._save_to_registry(config)
+                else:
+                    self._save_to_file(config)
+            except Exception as e:
+                with self._lock:
+                    self._dirty = True
+                if self.on_error:
+                    self.on_error(e)
+
+    def _to_dict(self) -> dict:
+        return {
+            'current_voltage': int(self.current_voltage),
+            'current_fan_speed': self.current_fan_speed,
+            'pump_is_off': self.pump_is_off,
+            'fan_is_off': self.fan_is_off,
+            'rgb_state': int(self.rgb_state),
+            'rgb_is_off': self.rgb_is_off,
+            'rgb_color': list(self.rgb_color),
+            'auto_start': self.auto_start,
+            'auto_connect': self.auto_connect,
+            'auto_thermal': self.auto_thermal,
+            'profiles': {name: profile.to_dict() for name, profile in self.profiles.items()}
+        }
 
     def _load_from_registry(self):
         try:
@@ -48,26 +158,25 @@ class Settings:
             self.rgb_color = tuple(winreg.QueryValueEx(key, "rgb_color")[0])
             self.auto_start = bool(winreg.QueryValueEx(key, "auto_start")[0])
             self.auto_connect = bool(winreg.QueryValueEx(key, "auto_connect")[0])
+            self.auto_thermal = bool(winreg.QueryValueEx(key, "auto_thermal")[0])
+            self.profiles = self._profiles_from_dict(json.loads(winreg.QueryValueEx(key, "profiles")[0]))
             winreg.CloseKey(key)
         except:
             pass
 
-    def _save_to_registry(self):
+    def _save_to_registry(self, config: dict):
+        import winreg
+        key = winreg.CreateKey(winreg.HKEY_CURRENT_USER, self.REGISTRY_KEY)
         try:
-            import winreg
-            key = winreg.CreateKey(winreg.HKEY_CURRENT_USER, self.REGISTRY_KEY)
-            winreg.SetValueEx(key, "current_voltage", 0, winreg.REG_DWORD, self.current_voltage)
-            winreg.SetValueEx(key, "current_fan_speed", 0, winreg.REG_DWORD, self.current_fan_speed)
-            winreg.SetValueEx(key, "pump_is_off", 0, winreg.REG_DWORD, int(self.pump_is_off))
-            winreg.SetValueEx(key, "fan_is_off", 0, winreg.REG_DWORD, int(self.fan_is_off))
-            winreg.SetValueEx(key, "rgb_state", 0, winreg.REG_DWORD, self.rgb_state)
-            winreg.SetValueEx(key, "rgb_is_off", 0, winreg.REG_DWORD, int(self.rgb_is_off))
-            winreg.SetValueEx(key, "rgb_color", 0, winreg.REG_BINARY, bytes(self.rgb_color))
-            winreg.SetValueEx(key, "auto_start", 0, winreg.REG_DWORD, int(self.auto_start))
-            winreg.SetValueEx(key, "auto_connect", 0, winreg.REG_DWORD, int(self.auto_connect))
+            for name, value in config.items():
+                if name == 'rgb_color':
+                    winreg.SetValueEx(key, name, 0, winreg.REG_BINARY, bytes(value))
+                elif name == 'profiles':
+                    winreg.SetValueEx(key, name, 0, winreg.REG_SZ, json.dumps(value))
+                else:
+                    winreg.SetValueEx(key, name, 0, winreg.REG_DWORD, int(value))
+        finally:
             winreg.CloseKey(key)
-        except:
-            pass
 
     def _load_from_file(self):
         try:
@@ -82,31 +191,23 @@ class Settings:
                 self.rgb_color = tuple(config['rgb_color'])
                 self.auto_start = config['auto_start']
                 self.auto_connect = config['auto_connect']
+                self.auto_thermal = config['auto_thermal']
+                self.profiles = self._profiles_from_dict(config['profiles'])
         except:
             pass
 
-    def _save_to_file(self):
-        try:
-            config = {
-                'current_voltage': self.current_voltage,
-                'current_fan_speed': self.current_fan_speed,
-                'pump_is_off': self.pump_is_off,
-                'fan_is_off': self.fan_is_off,
-                'rgb_state': self.rgb_state,
-                'rgb_is_off': self.rgb_is_off,
-                'rgb_color': self.rgb_color,
-                'auto_start': self.auto_start,
-                'auto_connect': self.auto_connect
-            }
-            with open(self.CONFIG_FILE, 'w') as f:
-                json.dump(config, f)
-        except:
-            pass 
+    @staticmethod
+    def _profiles_from_dict(config: dict) -> Dict[str, Profile]:
+        return {name: Profile.from_dict(name, values) for name, values in config.items()}
+
+    def _save_to_file(self, config: dict):
+        write_file_atomic(self.CONFIG_FILE, json.dumps(config))
 
     def set_autostart(self, autostart: bool):
         self.auto_start = autostart
         
         if platform.system() == 'Windows':
+            import winshell
             startup_dir = winshell.startup()
             shortcut_path = join(startup_dir, f"{splitext(basename(executable))[0]}.lnk")
             
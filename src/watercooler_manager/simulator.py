@@ -0,0 +1,225 @@
+import asyncio
+import inspect
+import random
+from typing import Callable, Dict, List, Optional, Sequence
+from .enums import Commands, NordicUART, PumpVoltage, RGBState
+from .models import LCTDeviceModel
+from .protocol import decode
+
+# In-process stand-in for an LCT21001/LCT22002 cooler and its BLE link, used
+# for benchmarks and for running the app without hardware:
+#   backend = SimulatedBackend([SimulatedCooler()])
+#   device = WaterCoolingDevice(backend=backend)
+
+class SimulatedBLEDevice:
+    def __init__(self, address: str, name: str):
+        self.address = address
+        self.name = name
+
+class SimulatedAdvertisement:
+    def __init__(self, rssi: int, service_uuids: Sequence[str] = ()):
+        self.rssi = rssi
+        self.service_uuids = list(service_uuids)
+
+class SimulatedCooler:
+    def __init__(self, address: str = "SIM:00:00:00:00:01", model: str = LCTDeviceModel.LCT21001,
+                 rssi: int = -60, advertise_interval: float = 0.1, connect_time: float = 0.15,
+                 connection_interval: float = 0.030, jitter: float = 0.0,
+                 write_failure_rate: float = 0.0, disconnect_rate: float = 0.0,
+                 supports_write_without_response: bool = True, seed: Optional[int] = None,
+                 adapter_rssi: Optional[Dict[str, int]] = None,
+                 service_uuids: Sequence[str] = (NordicUART.SERVICE_UUID,)):
+        self.address = address
+        self.name = f"{model}-COOLER"
+        self.model = model
+        self.rssi = rssi
+        # Signal strength per adapter name; adapters not listed hear it at `rssi`
+        self.adapter_rssi = adapter_rssi or {}
+        # Services listed in the advert; an empty list hides the cooler from filtered scans
+        self.service_uuids = list(service_uuids)
+        self.advertise_interval = advertise_interval
+        self.connect_time = connect_time
+        self.connection_interval = connection_interval
+        self.jitter = jitter
+        self.write_failure_rate = write_failure_rate
+        self.disconnect_rate = disconnect_rate
+        self.supports_write_without_response = supports_write_without_response
+        self.powered = True
+        self.random = random.Random(seed)
+
+        self.pump_on = False
+        self.pump_duty = 0
+        self.pump_voltage = PumpVoltage.V7
+        self.fan_on = False
+        self.fan_duty = 0
+        self.rgb_on = False
+        self.rgb_color = (0, 0, 0)
+        self.rgb_state = RGBState.STATIC
+        self.frames_received = 0
+        self.resets = 0
+        self.link: Optional["SimulatedLink"] = None
+
+    def rssi_for(self, adapter: Optional[str]) -> int:
+        return self.adapter_rssi.get(adapter, self.rssi)
+
+    def latency(self, intervals: float) -> float:
+        return intervals * self.connection_interval + self.random.uniform(0, self.jitter)
+
+    def handle(self, frame: bytes):
+        command, payload = decode(frame)
+        self.frames_received += 1
+        on = payload[0] == 0x01
+        if command == Commands.PUMP:
+            self.pump_on = on
+            if on:
+                self.pump_duty, self.pump_voltage = payload[1], PumpVoltage(payload[2])
+        elif command == Commands.FAN:
+            self.fan_on = on
+            if on:
+                self.fan_duty = payload[1]
+        elif command == Commands.RGB:
+            self.rgb_on = on
+            if on:
+                self.rgb_color, self.rgb_state = tuple(payload[1:4]), RGBState(payload[4])
+        elif command == Commands.RESET:
+            self.resets += 1
+            self.pump_on = self.fan_on = self.rgb_on = False
+        # The simulated firmware echoes every accepted frame as a status report
+        if self.link is not None:
+            self.link.notify(frame)
+
+    def drop_connection(self):
+        # Simulates the cooler going out of range or being switched off mid-session
+        if self.link is not None:
+            self.link.lost()
+
+class SimulatedScanner:
+    def __init__(self, backend: "SimulatedBackend", detection_callback: Callable, adapter: Optional[str] = None,
+                 service_uuids: Optional[Sequence[str]] = None):
+        # Same check as BleakScanner, so callbacks bleak would reject fail here too
+        if len(inspect.signature(detection_callback).parameters) != 2:
+            raise TypeError("callback must be callable with 2 parameters")
+        self.backend = backend
+        self.detection_callback = detection_callback
+        self.adapter = adapter
+        self.service_uuids = {uuid.lower() for uuid in service_uuids} if service_uuids else None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._advertise(cooler)) for cooler in self.backend.coolers
+                       if self.service_uuids is None or self.service_uuids.intersection(map(str.lower, cooler.service_uuids))]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+    async def _advertise(self, cooler: SimulatedCooler):
+        # First advert lands somewhere within one advertising interval
+        await asyncio.sleep(cooler.random.uniform(0, cooler.advertise_interval))
+        while True:
+            if cooler.powered and cooler.link is None:
+                self.detection_callback(SimulatedBLEDevice(cooler.address, cooler.name),
+                                        SimulatedAdvertisement(cooler.rssi_for(self.adapter), cooler.service_uuids))
+            await asyncio.sleep(cooler.advertise_interval)
+
+class SimulatedLink:
+    def __init__(self, backend: "SimulatedBackend", address: str,
+                 disconnected_callback: Optional[Callable[[], None]] = None, adapter: Optional[str] = None):
+        self.backend = backend
+        self.address = address
+        self.disconnected_callback = disconnected_callback
+        self.adapter = adapter
+        self.cooler: Optional[SimulatedCooler] = None
+        self.supports_write_without_response = False
+        self._notify: Optional[Callable[[bytearray], None]] = None
+        self._busy_until = 0.0
+
+    @property
+    def is_connected(self) -> bool:
+        return self.cooler is not None
+
+    async def connect(self, timeout: float = 5.0):
+        cooler = self.backend.cooler(self.address)
+        if cooler is None or not cooler.powered or cooler.link is not None:
+            await asyncio.sleep(timeout)
+            raise Exception(f"Device with address {self.address} was not found")
+        await asyncio.sleep(cooler.connect_time)
+        cooler.link = self
+        self.cooler = cooler
+        self.supports_write_without_response = cooler.supports_write_without_response
+
+    async def disconnect(self):
+        if self.cooler is not None:
+            await asyncio.sleep(self.cooler.latency(1))
+            self.lost()
+
+    def lost(self):
+        if self.cooler is not None:
+            self.cooler.link = None
+            self.cooler = None
+            self._notify = None
+            if self.disconnected_callback is not None:
+                self.disconnected_callback()
+
+    async def write(self, data: bytes, response: bool = True):
+        cooler = self.cooler
+        if cooler is None:
+            raise Exception("Not connected")
+
+        # Unacknowledged writes go out on the next connection events without
+        # blocking; an acknowledged write waits for them plus a round trip
+        loop = asyncio.get_running_loop()
+        start = max(loop.time(), self._busy_until)
+        if response or not self.supports_write_without_response:
+            self._busy_until = start + cooler.latency(2)
+            await asyncio.sleep(self._busy_until - loop.time())
+        else:
+            # Controller buffers are small: once they are full the writer waits
+            await asyncio.sleep(start - loop.time())
+            self._busy_until = loop.time() + cooler.latency(0.25)
+
+        if self.cooler is not cooler:
+            raise Exception("Disconnected")
+        if cooler.random.random() < cooler.disconnect_rate:
+            self.lost()
+            raise Exception("Disconnected")
+        if cooler.random.random() < cooler.write_failure_rate:
+            raise Exception("Write failed")
+        cooler.handle(bytes(data))
+
+    async def start_notify(self, callback: Callable[[bytearray], None]) -> bool:
+        self._notify = callback
+        return True
+
+    def notify(self, data: bytes):
+        if self._notify is not None:
+            loop = asyncio.get_running_loop()
+            loop.call_later(self.cooler.latency(1), self._deliver, bytearray(data))
+
+    def _deliver(self, data: bytearray):
+        if self._notify is not None:
+            self._notify(data)
+
+class SimulatedBackend:
+    def __init__(self, coolers: Sequence[SimulatedCooler] = (), adapters: Sequence[str] = ()):
+        self.coolers: List[SimulatedCooler] = list(coolers) or [SimulatedCooler()]
+        self.adapter_names: List[Optional[str]] = list(adapters) or [None]
+
+    def cooler(self, address: str) -> Optional[SimulatedCooler]:
+        for cooler in self.coolers:
+            if cooler.address.lower() == address.lower():
+                return cooler
+        return None
+
+    def adapters(self) -> List[Optional[str]]:
+        return list(self.adapter_names)
+
+    def scanner(self, detection_callback: Callable, adapter: Optional[str] = None,
+                service_uuids: Optional[Sequence[str]] = None) -> SimulatedScanner:
+        return SimulatedScanner(self, detection_callback, adapter, service_uuids)
+
+    def link(self, device, disconnected_callback: Optional[Callable[[], None]] = None,
+             adapter: Optional[str] = None) -> SimulatedLink:
+        return SimulatedLink(self, getattr(device, "address", device), disconnected_callback, adapter)
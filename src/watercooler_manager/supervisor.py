@@ -0,0 +1,99 @@
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Optional
+from .device import WaterCoolingDevice
+from .models import DeviceInfo
+
+class ReconnectSupervisor:
+    # Notices when the link drops without disconnect() being called, reconnects
+    # to the same address with jittered exponential backoff and restores the
+    # cooler's state. watch() arms it after a connect, stop() disarms it.
+    def __init__(self, device: WaterCoolingDevice, restore: Callable[[], Awaitable],
+                 on_state: Optional[Callable[[bool], None]] = None,
+                 base_delay: float = 0.5, max_delay: float = 30.0, seed: Optional[int] = None):
+        self.device = device
+        self.restore = restore
+        self.on_state = on_state
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.target: Optional[DeviceInfo] = None
+        self.recoveries = 0
+        self.recovery_total = 0.0
+        self.failed_attempts = 0
+        self._random = random.Random(seed)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def recovering(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def mttr(self) -> float:
+        return self.recovery_total / self.recoveries if self.recoveries else 0.0
+
+    def watch(self, target: DeviceInfo):
+        # Must be called on the event loop, once target is connected
+        self.target = target
+        self._loop = asyncio.get_running_loop()
+        self.device.on_connection_lost = self._on_lost
+
+    def stop(self):
+        self.target = None
+        self.device.on_connection_lost = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def wait(self, timeout: Optional[float] = None) -> bool:
+        # Waits for a recovery in progress; True if the device is connected afterwards
+        if self.recovering:
+            try:
+                await asyncio.wait_for(asyncio.shield(self._task), timeout)
+            except asyncio.TimeoutError:
+                return False
+        return await self.device.is_connected()
+
+    def delay(self, attempt: int) -> float:
+        # Equal jitter: half the exponential step plus a random share of the other half
+        step = min(self.max_delay, self.base_delay * 2 ** attempt)
+        return step / 2 + self._random.uniform(0, step / 2)
+
+    def _on_lost(self):
+        # bleak may report the disconnect from another thread
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._start_recovery)
+
+    def _start_recovery(self):
+        if self.target is None or self.recovering:
+            return
+        self._task = self._loop.create_task(self._recover(self.target))
+
+    async def _recover(self, target: DeviceInfo):
+        if self.on_state is not None:
+            self.on_state(False)
+        start = time.perf_counter()
+        attempt = 0
+        while self.target is target:
+            try:
+                if not await self.device.is_connected():
+                    await self.device.connect(target.uuid, name=target.name, adapter=target.adapter)
+                await self.restore()
+                break
+            except Exception:
+                self.failed_attempts += 1
+                await asyncio.sleep(self.delay(attempt))
+                attempt += 1
+        else:
+            return
+
+        elapsed = time.perf_counter() - start
+        self.recoveries += 1
+        self.recovery_total += elapsed
+        metrics = self.device.metrics
+        if metrics is not None:
+            metrics.reconnects += 1
+            metrics.recovery_seconds.observe(elapsed)
+        if self.on_state is not None:
+            self.on_state(True)
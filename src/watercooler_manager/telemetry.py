@@ -0,0 +1,115 @@
+import asyncio
+import time
+from array import array
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from .enums import Commands
+from .protocol import FrameDecoder
+
+# Names for payload bytes 2..6 of each frame type
+CHANNELS = {
+    Commands.RESET: ("reset.state", "reset.value", None, None, None),
+    Commands.FAN: ("fan.state", "fan.duty", None, None, None),
+    Commands.PUMP: ("pump.state", "pump.duty", "pump.voltage", None, None),
+    Commands.RGB: ("rgb.state", "rgb.red", "rgb.green", "rgb.blue", "rgb.mode"),
+}
+
+class RingBuffer:
+    # Fixed-size, array-backed storage: memory does not grow with uptime
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self.timestamps = array('d', bytes(8 * capacity))
+        self.values = array('d', bytes(8 * capacity))
+        self.count = 0
+        self._next = 0
+
+    def append(self, timestamp: float, value: float):
+        self.timestamps[self._next] = timestamp
+        self.values[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def latest(self) -> Optional[Tuple[float, float]]:
+        if not self.count:
+            return None
+        i = self._next - 1
+        return self.timestamps[i], self.values[i]
+
+    def window(self, seconds: float, now: Optional[float] = None) -> Optional[Tuple[float, float, float]]:
+        # (min, max, mean) of the samples that arrived in the last `seconds`
+        cutoff = (now if now is not None else time.time()) - seconds
+        total = 0.0
+        low = high = None
+        n = 0
+        i = self._next
+        for _ in range(self.count):
+            i = (i - 1) % self.capacity
+            if self.timestamps[i] < cutoff:
+                break
+            value = self.values[i]
+            total += value
+            low = value if low is None or value < low else low
+            high = value if high is None or value > high else high
+            n += 1
+        if not n:
+            return None
+        return low, high, total / n
+
+class Telemetry:
+    def __init__(self, capacity: int = 4096, max_channels: int = 64):
+        self.capacity = capacity
+        self.max_channels = max_channels
+        self.channels: Dict[str, RingBuffer] = {}
+        self.frames = 0
+        self.errors = 0
+        self._decoder = FrameDecoder()
+        self._subscribers: List[asyncio.Queue] = []
+
+    def feed(self, data: bytes, timestamp: Optional[float] = None):
+        timestamp = timestamp if timestamp is not None else time.time()
+        errors = self._decoder.errors
+        for frame in self._decoder.feed(data):
+            self._decode(frame, timestamp)
+        self.errors += self._decoder.errors - errors
+
+    def _decode(self, frame: bytes, timestamp: float):
+        self.frames += 1
+        command = frame[1]
+        names = CHANNELS.get(command)
+        for offset in range(5):
+            name = names[offset] if names else f"0x{command:02x}.{offset}"
+            if name is not None:
+                self.record(name, frame[2 + offset], timestamp)
+
+    def record(self, channel: str, value: float, timestamp: Optional[float] = None):
+        timestamp = timestamp if timestamp is not None else time.time()
+        buffer = self.channels.get(channel)
+        if buffer is None:
+            # Unknown frame types get raw channels; cap them so noise cannot grow memory
+            if len(self.channels) >= self.max_channels:
+                self.errors += 1
+                return
+            buffer = self.channels[channel] = RingBuffer(self.capacity)
+        buffer.append(timestamp, value)
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait((channel, timestamp, value))
+
+    def latest(self, channel: str) -> Optional[Tuple[float, float]]:
+        buffer = self.channels.get(channel)
+        return buffer.latest() if buffer else None
+
+    def window(self, channel: str, seconds: float) -> Optional[Tuple[float, float, float]]:
+        buffer = self.channels.get(channel)
+        return buffer.window(seconds) if buffer else None
+
+    async def subscribe(self, maxsize: int = 256) -> AsyncIterator[Tuple[str, float, float]]:
+        # Slow consumers lose the oldest samples instead of growing the queue
+        queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self._subscribers.append(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._subscribers.remove(queue)
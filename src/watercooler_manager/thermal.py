@@ -0,0 +1,159 @@
+import os
+import glob
+import asyncio
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+from .enums import PumpVoltage
+from .protocol import fan_frame, pump_frame
+
+# Sensor names (hwmon "name" / thermal zone "type") that belong to the CPU or GPU
+SENSOR_NAMES = ('coretemp', 'k10temp', 'zenpower', 'x86_pkg_temp', 'cpu', 'tcpu',
+                'amdgpu', 'nouveau', 'radeon', 'gpu')
+
+# (temperature °C, fan duty %, pump voltage), sorted by temperature
+DEFAULT_CURVE = (
+    (0, 25, PumpVoltage.V7),
+    (55, 50, PumpVoltage.V7),
+    (70, 75, PumpVoltage.V8),
+    (80, 90, PumpVoltage.V11),
+)
+
+class ThermalSensors:
+    def __init__(self, root: str = "/", names: Sequence[str] = SENSOR_NAMES):
+        self.root = root
+        self.names = names
+        self.sensors: Dict[str, int] = {}
+        self._open()
+
+    @property
+    def available(self) -> bool:
+        return bool(self.sensors)
+
+    def _label(self, path: str) -> Optional[str]:
+        try:
+            with open(path) as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    def _candidates(self) -> List[Tuple[str, str]]:
+        candidates = []
+        for zone in sorted(glob.glob(os.path.join(self.root, "sys/class/thermal/thermal_zone*"))):
+            label = self._label(os.path.join(zone, "type"))
+            if label:
+                candidates.append((f"{os.path.basename(zone)}:{label}", os.path.join(zone, "temp")))
+        for hwmon in sorted(glob.glob(os.path.join(self.root, "sys/class/hwmon/hwmon*"))):
+            label = self._label(os.path.join(hwmon, "name"))
+            if label:
+                for path in sorted(glob.glob(os.path.join(hwmon, "temp*_input"))):
+                    candidates.append((f"{label}:{os.path.basename(path)}", path))
+        return candidates
+
+    def _open(self):
+        # Files are opened once and re-read with pread, so a sample costs one syscall per sensor
+        for label, path in self._candidates():
+            if not any(name in label.lower() for name in self.names):
+                continue
+            try:
+                self.sensors[label] = os.open(path, os.O_RDONLY)
+            except OSError:
+                pass
+
+    def read(self) -> Dict[str, float]:
+        temperatures = {}
+        for label, fd in self.sensors.items():
+            try:
+                temperatures[label] = int(os.pread(fd, 16, 0)) / 1000.0
+            except (OSError, ValueError):
+                pass
+        return temperatures
+
+    def max_temperature(self) -> Optional[float]:
+        highest = None
+        for fd in self.sensors.values():
+            try:
+                value = int(os.pread(fd, 16, 0))
+            except (OSError, ValueError):
+                continue
+            if highest is None or value > highest:
+                highest = value
+        return highest / 1000.0 if highest is not None else None
+
+    def close(self):
+        for fd in self.sensors.values():
+            os.close(fd)
+        self.sensors = {}
+
+class ThermalCurve:
+    def __init__(self, points: Sequence[Tuple[float, int, PumpVoltage]] = DEFAULT_CURVE, hysteresis: float = 3.0):
+        self.points = sorted(points, key=lambda point: point[0])
+        self.hysteresis = hysteresis
+
+    def level_for(self, temperature: float, current: Optional[int] = None) -> int:
+        level = 0
+        for i, point in enumerate(self.points):
+            if temperature >= point[0]:
+                level = i
+        # Only step down once the temperature is clearly below the current threshold
+        if current is not None and level < current:
+            if temperature > self.points[current][0] - self.hysteresis:
+                return current
+        return level
+
+    def target(self, level: int) -> Tuple[int, PumpVoltage]:
+        return self.points[level][1], self.points[level][2]
+
+class ThermalController:
+    def __init__(self, device, sensors: Optional[ThermalSensors] = None, curve: Optional[ThermalCurve] = None,
+                 interval: float = 1.0, min_write_interval: float = 5.0):
+        self.device = device
+        self.sensors = sensors or ThermalSensors()
+        self.curve = curve or ThermalCurve()
+        self.interval = interval
+        self.min_write_interval = min_write_interval
+        self.level: Optional[int] = None
+        self.target: Optional[Tuple[int, PumpVoltage]] = None
+        self.temperature: Optional[float] = None
+        self.writes = 0
+        self._last_write = float("-inf")
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self.level = None
+        self.target = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.step()
+            except Exception:
+                # Keep sampling; a failed write is retried on the next tick
+                pass
+            await asyncio.sleep(self.interval)
+
+    async def step(self):
+        self.temperature = self.sensors.max_temperature()
+        if self.temperature is None:
+            return
+        level = self.curve.level_for(self.temperature, self.level)
+        target = self.curve.target(level)
+        if target == self.target:
+            self.level = level
+            return
+        now = time.monotonic()
+        if now - self._last_write < self.min_write_interval:
+            return
+
+        fan_speed, voltage = target
+        await self.device.write_frames([pump_frame(pump_voltage=voltage), fan_frame(fan_speed)])
+        self._last_write = now
+        self.level = level
+        self.target = target
+        self.writes += 1
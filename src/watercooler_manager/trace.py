@@ -0,0 +1,186 @@
+import os
+import sys
+import mmap
+import time
+import struct
+import asyncio
+import argparse
+from typing import Iterator, List, Optional, Tuple
+
+# Binary trace of the frames exchanged with a cooler. A trace file is a 24-byte
+# header followed by fixed 24-byte records, preallocated and memory-mapped, so
+# recording a frame is a struct.pack_into() and nothing else:
+#   header: magic, version, record size, capacity, records written
+#   record: time.time(), flags, length, up to 8 data bytes
+# Longer RX notifications are split over several records.
+MAGIC = b"WCTRACE\x00"
+VERSION = 1
+HEADER = struct.Struct("<8sHHIQ")
+RECORD = struct.Struct("<dBB8s6x")
+RECORD_DATA = 8
+
+# Record flags
+RX = 0x01
+ACKNOWLEDGED = 0x02
+
+Record = Tuple[float, int, bytes]
+
+class TraceRecorder:
+    def __init__(self, path: str, max_bytes: int = 1 << 20, backups: int = 1):
+        # At most (backups + 1) * max_bytes on disk: path, path.1, ... path.N
+        self.path = path
+        self.capacity = max(1, (max_bytes - HEADER.size) // RECORD.size)
+        self.backups = backups
+        self.count = 0
+        self.rotations = 0
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        # A trace left by an earlier run is what a bug report needs; keep it as path.1
+        if os.path.exists(path):
+            self._shift()
+        self._open()
+
+    def _open(self):
+        size = HEADER.size + self.capacity * RECORD.size
+        self._file = open(self.path, "w+b")
+        self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), size)
+        self.count = 0
+        HEADER.pack_into(self._map, 0, MAGIC, VERSION, RECORD.size, self.capacity, 0)
+
+    def _close(self):
+        if self._map is not None:
+            self._map.flush()
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _shift(self):
+        for i in range(self.backups, 0, -1):
+            source = self.path if i == 1 else f"{self.path}.{i - 1}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{i}")
+        if not self.backups:
+            os.remove(self.path)
+
+    def _rotate(self):
+        self._close()
+        self._shift()
+        self.rotations += 1
+        self._open()
+
+    def record(self, flags: int, data, timestamp: Optional[float] = None):
+        if self._map is None:
+            return
+        if timestamp is None:
+            timestamp = time.time()
+        if len(data) == RECORD_DATA and self.count < self.capacity:
+            # The common case: exactly one frame
+            RECORD.pack_into(self._map, HEADER.size + self.count * RECORD.size, timestamp, flags, RECORD_DATA, data)
+            self.count += 1
+            # Readers trust the header count, so a crash never exposes a torn record
+            struct.pack_into("<Q", self._map, HEADER.size - 8, self.count)
+            return
+        for offset in range(0, len(data), RECORD_DATA):
+            if self.count == self.capacity:
+                self._rotate()
+            chunk = bytes(data[offset:offset + RECORD_DATA])
+            RECORD.pack_into(self._map, HEADER.size + self.count * RECORD.size, timestamp, flags, len(chunk), chunk)
+            self.count += 1
+            struct.pack_into("<Q", self._map, HEADER.size - 8, self.count)
+
+    def close(self):
+        self._close()
+
+def read_trace(path: str) -> Iterator[Record]:
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, record_size, capacity, count = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+        raise ValueError(f"{path} is not a watercooler trace")
+    for i in range(min(count, capacity)):
+        timestamp, flags, length, chunk = RECORD.unpack_from(data, HEADER.size + i * RECORD.size)
+        yield timestamp, flags, chunk[:length]
+
+def read_traces(path: str) -> Iterator[Record]:
+    # Rotated files first, oldest to newest, then the live one
+    paths: List[str] = []
+    i = 1
+    while os.path.exists(f"{path}.{i}"):
+        paths.insert(0, f"{path}.{i}")
+        i += 1
+    paths.append(path)
+    for name in paths:
+        yield from read_trace(name)
+
+async def replay(link, records: List[Record], speed: float = 1.0) -> Tuple[int, float, float]:
+    # Streams the TX frames of a trace through a connected transport link with
+    # their original spacing divided by `speed` (0 = as fast as possible).
+    # Returns (frames sent, elapsed seconds, worst lateness in seconds).
+    loop = asyncio.get_running_loop()
+    frames = [(timestamp, flags, data) for timestamp, flags, data in records if not flags & RX]
+    if not frames:
+        return 0, 0.0, 0.0
+    first = frames[0][0]
+    start = loop.time()
+    late = 0.0
+    for timestamp, flags, data in frames:
+        if speed > 0:
+            due = start + (timestamp - first) / speed
+            delay = due - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                late = max(late, -delay)
+        await link.write(data, bool(flags & ACKNOWLEDGED))
+    return len(frames), loop.time() - start, late
+
+def dump(path: str):
+    first = None
+    for timestamp, flags, data in read_traces(path):
+        first = timestamp if first is None else first
+        direction = "RX" if flags & RX else "TX"
+        ack = " ack" if flags & ACKNOWLEDGED else ""
+        print(f"{timestamp - first:12.6f}  {direction}{ack:4s}  {data.hex(' ')}")
+
+async def _replay(args):
+    if args.simulate:
+        from .simulator import SimulatedBackend
+        backend = SimulatedBackend()
+        address = backend.coolers[0].address
+    else:
+        from .transport import BleakBackend
+        backend = BleakBackend()
+        address = args.address
+        if address is None:
+            raise SystemExit("--address is required unless --simulate is given")
+    link = backend.link(address)
+    await link.connect(timeout=10.0)
+    try:
+        sent, elapsed, late = await replay(link, list(read_traces(args.file)), args.speed)
+    finally:
+        await link.disconnect()
+    rate = sent / elapsed if elapsed else 0.0
+    print(f"replayed {sent} frames in {elapsed:.3f} s ({rate:.1f} frames/s), worst lateness {late * 1000:.1f} ms")
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m watercooler_manager.trace", description="Inspect or replay a frame trace")
+    commands = parser.add_subparsers(dest="command", required=True)
+    dump_parser = commands.add_parser("dump", help="Print the records of a trace")
+    dump_parser.add_argument("file")
+    replay_parser = commands.add_parser("replay", help="Send the TX frames of a trace to a cooler")
+    replay_parser.add_argument("file")
+    replay_parser.add_argument("--speed", type=float, default=1.0, help="Time scale; 2 plays twice as fast, 0 without pauses")
+    replay_parser.add_argument("--address", help="Cooler to replay to")
+    replay_parser.add_argument("--simulate", action="store_true", help="Replay to the in-process simulated cooler")
+    args = parser.parse_args(argv)
+
+    if args.command == "dump":
+        dump(args.file)
+    else:
+        asyncio.run(_replay(args))
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+import os
+import sys
+from typing import Callable, List, Optional
+from .enums import NordicUART
+
+# A backend provides scanning and links; WaterCoolingDevice only talks to
+# these, so the BLE stack can be swapped for the simulator in simulator.py.
+# Detection callbacks receive (device, adv) where device has .address and
+# .name and adv has .rssi, as with bleak. A link calls its
+# disconnected_callback whenever the connection ends, requested or not.
+# adapters() lists the radios to scan on; None stands for the default one.
+
+BLUETOOTH_CLASS = "/sys/class/bluetooth"
+
+class BleakLink:
+    def __init__(self, device, disconnected_callback: Optional[Callable[[], None]] = None,
+                 adapter: Optional[str] = None):
+        from bleak import BleakClient
+        callback = (lambda client: disconnected_callback()) if disconnected_callback else None
+        kwargs = {"adapter": adapter} if adapter else {}
+        self.client = BleakClient(device, disconnected_callback=callback, **kwargs)
+        self.supports_write_without_response = False
+
+    @property
+    def is_connected(self) -> bool:
+        return self.client.is_connected
+
+    async def connect(self, timeout: float = 5.0):
+        await self.client.connect(timeout=timeout)
+        char = self.client.services.get_characteristic(NordicUART.CHAR_TX)
+        self.supports_write_without_response = char is not None and "write-without-response" in char.properties
+
+    async def disconnect(self):
+        await self.client.disconnect()
+
+    async def write(self, data: bytes, response: bool = True):
+        await self.client.write_gatt_char(NordicUART.CHAR_TX, data, response=response)
+
+    async def start_notify(self, callback: Callable[[bytearray], None]) -> bool:
+        if self.client.services.get_characteristic(NordicUART.CHAR_RX) is None:
+            return False
+        await self.client.start_notify(NordicUART.CHAR_RX, lambda sender, data: callback(data))
+        return True
+
+class BleakBackend:
+    def adapters(self) -> List[Optional[str]]:
+        # Only BlueZ lets bleak pick the adapter (hci0, hci1, ...); elsewhere
+        # the OS default is used. "hci0:64"-style entries are connections.
+        if sys.platform.startswith("linux"):
+            try:
+                names = sorted(name for name in os.listdir(BLUETOOTH_CLASS) if ":" not in name)
+            except OSError:
+                names = []
+            if names:
+                return names
+        return [None]
+
+    def scanner(self, detection_callback: Callable, adapter: Optional[str] = None,
+                service_uuids: Optional[List[str]] = None):
+        # service_uuids is handed to the OS scan filter (BlueZ discovery filter,
+        # CoreBluetooth, WinRT), so unrelated adverts never reach Python
+        from bleak import BleakScanner
+        kwargs = {"adapter": adapter} if adapter else {}
+        return BleakScanner(detection_callback=detection_callback, service_uuids=service_uuids, **kwargs)
+
+    def link(self, device, disconnected_callback: Optional[Callable[[], None]] = None,
+             adapter: Optional[str] = None) -> BleakLink:
+        return BleakLink(device, disconnected_callback, adapter)
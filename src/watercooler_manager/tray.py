@@ -1,19 +1,39 @@
 
 APP_VERSION = "v1.2.0"
 
-import pystray
-from PIL import Image
-from typing import Callable
+from typing import Callable, Dict
 import os
 import webbrowser
 
+ICON_DIR = os.path.join(os.path.dirname(__file__), "..", "icons")
+
+# States without their own image yet fall back to the disconnected icon
+ICON_FALLBACK = "disconnected"
+
+# Decoded once per process and shared by every tray instance
+_icon_cache: Dict[str, object] = {}
+
+def load_icon(state: str):
+    image = _icon_cache.get(state)
+    if image is None:
+        from PIL import Image
+        path = os.path.join(ICON_DIR, f"{state}.png")
+        if not os.path.exists(path) and state != ICON_FALLBACK:
+            image = load_icon(ICON_FALLBACK)
+        else:
+            image = Image.open(path)
+            image.load()
+        _icon_cache[state] = image
+    return image
+
 class SystemTrayIcon:
     def __init__(self, on_connect: Callable, on_disconnect: Callable, 
-                 on_pump_settings: Callable, on_fan_settings: Callable,
+                 on_profile_settings: Callable, on_pump_settings: Callable, on_fan_settings: Callable,
                  on_rgb_settings: Callable, on_autostart_settings: Callable, on_autoconnect_settings: Callable, on_exit: Callable, settings, version: str = APP_VERSION):
         self.icon = None
         self.on_connect = on_connect
         self.on_disconnect = on_disconnect
+        self.on_profile_settings = on_profile_settings
         self.on_pump_settings = on_pump_settings
         self.on_fan_settings = on_fan_settings
         self.on_rgb_settings = on_rgb_settings
@@ -21,23 +41,30 @@ class SystemTrayIcon:
         self.on_autoconnect_settings = on_autoconnect_settings
         self.on_exit = on_exit
         self.connected = False
+        self.state = "disconnected"
         self.settings = settings
         self.version = version
+        self._menu = None
 
-    def create_icon_image(self, connected: bool = False):        
-        icon_dir = os.path.join(os.path.dirname(__file__), "..", "icons")
-        if connected:
-            return Image.open(os.path.join(icon_dir, "connected.png"))
-        return Image.open(os.path.join(icon_dir, "disconnected.png"))
+    def create_icon_image(self, connected: bool = False):
+        return load_icon("connected" if connected else "disconnected")
+
+    def create_menu(self):
+        # Built once; labels and check marks are callables that pystray
+        # re-evaluates, so later changes only need icon.update_menu()
+        if self._menu is not None:
+            return self._menu
+
+        import pystray
 
-    def create_menu(self):        
         def open_releases(icon, item):
             webbrowser.open("https://github.com/tomups/watercooler-manager/releases/")
 
-        return (
-            pystray.MenuItem('Disconnect' if self.connected else 'Connect', 
-                           self.on_disconnect if self.connected else self.on_connect),
+        self._menu = pystray.Menu(
+            pystray.MenuItem(lambda _: 'Disconnect' if self.connected else 'Connect',
+                           self._on_connection_item),
             pystray.Menu.SEPARATOR,
+            pystray.MenuItem('Profiles', self.on_profile_settings()),
             pystray.MenuItem('Pump', self.on_pump_settings()),
             pystray.MenuItem('Fan', self.on_fan_settings()),
             pystray.MenuItem('RGB', self.on_rgb_settings()),
@@ -51,8 +78,16 @@ class SystemTrayIcon:
             )),
             pystray.MenuItem('Exit', self.on_exit)
         )
+        return self._menu
+
+    def _on_connection_item(self):
+        if self.connected:
+            self.on_disconnect()
+        else:
+            self.on_connect()
 
     def setup(self):
+        import pystray
         image = self.create_icon_image(connected=False)
         self.icon = pystray.Icon("WaterCooler", image, "Water Cooler Manager", self.create_menu())
 
@@ -65,10 +100,15 @@ class SystemTrayIcon:
             self.icon.stop()
 
     def update_connection_status(self, connected: bool):
+        self.set_state("connected" if connected else "disconnected")
+
+    def set_state(self, state: str):
         if self.icon:
-            self.connected = connected
-            self.icon.icon = self.create_icon_image(connected=connected)
-            self.icon.menu = self.create_menu()
+            self.connected = state == "connected"
+            if state != self.state:
+                self.state = state
+                self.icon.icon = load_icon(state)
+            self.icon.update_menu()
 
     def show_notification(self, message: str, title: str = "WaterCooler"):
         if self.icon: